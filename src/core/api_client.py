@@ -1,25 +1,140 @@
 """
 OpenAI API Client for audio transcription and text correction.
 
-This module provides a wrapper around the OpenAI API for Whisper transcription
-and GPT text correction with retry logic and error handling.
+This module provides an async wrapper around the OpenAI API for Whisper
+transcription and GPT text correction with retry logic and error handling.
+Coroutines are meant to run on the shared loop from core.async_runner.
 """
 
 from openai import (
-    OpenAI,
+    AsyncOpenAI,
     APIError,
     AuthenticationError,
     RateLimitError,
     APIConnectionError,
 )
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+import asyncio
+import hashlib
+import httpx
+import importlib.util
+import io
+import json
 import logging
+import os
+import re
+import struct
 import time
 import wave
-from typing import Callable, Any, Tuple
-from .config import get_model_config, MAX_RETRIES, RETRY_DELAY
+from collections import OrderedDict
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable, Any, Sequence, Tuple
+from .config import (
+    get_model_config,
+    MAX_RETRIES,
+    RETRY_DELAY,
+    RETRY_MAX_DELAY,
+    CORRECTION_CACHE_SIZE,
+    TRANSCRIPTION_CACHE_SIZE,
+    CORRECTION_BATCH_SIZE,
+    STREAM_CHUNK_CHARS,
+    BATCH_POLL_INTERVAL,
+    BATCH_POLL_MAX_INTERVAL,
+    API_REQUESTS_PER_MINUTE,
+    API_TOKENS_PER_MINUTE,
+    SILENCE_RMS_THRESHOLD,
+    PARALLEL_REQUESTS_MAX,
+    HTTP_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+)
+from .rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Static instructions are sent as the first message so the prompt prefix stays
+# byte-identical between requests and can be served from OpenAI's prompt cache.
+# History and user context follow in separate messages.
+DEFAULT_TRANSLATION_PROMPT = (
+    "Ты — профессиональный переводчик. Твоя задача — перевести предоставленный текст, сохраняя смысл и учитывая контекст диалога из предыдущих сообщений.\n"
+    "### ПРАВИЛА:\n"
+    "- Если текст на русском, переведи его на английский.\n"
+    "- Если текст на английском, переведи его на русский.\n"
+    "- Верни ТОЛЬКО переведенный текст."
+)
+DEFAULT_CORRECTION_PROMPT = (
+    "Ты — помощник, который исправляет распознанный текст. "
+    "Учитывай контекст диалога из предыдущих сообщений."
+)
+BATCH_FORMAT_PROMPT = (
+    "The user message contains several items marked '### ITEM <n>'. "
+    "Process each item independently and answer with one section per item, "
+    "in the same order, each starting with a line '### OUT <n>'."
+)
+_BATCH_OUT_RE = re.compile(r"^### OUT \d+[ \t]*$", re.MULTILINE)
+_SENTENCE_END_RE = re.compile(r"[.!?]\s")
+# Parts of x-ratelimit-reset-* durations such as "6m0s" or "120ms"
+_RESET_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_RESET_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+_WAV_HEADER_SIZE = 44
+# Rough characters-per-token ratio used to reserve rate limit capacity
+_CHARS_PER_TOKEN = 4
+
+# Jittered backoff keeps concurrent clients from retrying in lockstep
+_RETRY_BACKOFF = wait_exponential_jitter(initial=RETRY_DELAY, max=RETRY_MAX_DELAY)
+
+# Stateless retry strategies, shared by every _execute_with_retry call
+_RETRY_ON = retry_if_exception_type((RateLimitError, APIConnectionError))
+_RETRY_STOP = stop_after_attempt(MAX_RETRIES + 1)
+
+# Transcription models that support stream=True (whisper-1 does not)
+STREAMING_TRANSCRIPTION_MODELS = frozenset(
+    {"gpt-4o-transcribe", "gpt-4o-mini-transcribe"}
+)
+
+# HTTP/2 lets transcription and correction share one multiplexed connection;
+# it needs the optional h2 package (httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# One connection pool for every ApiClient, so a client re-created after an
+# API key change keeps the warm TLS connections
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide HTTP client, creating it on first use.
+
+    Returns:
+        Shared httpx.AsyncClient with keepalive connection pooling
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client. Must run on the loop that used it."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class ApiClient:
     """
@@ -29,6 +144,8 @@ class ApiClient:
     text correction/chat completion using GPT models.
     """
 
+    __slots__ = ("client", "config", "_exact_cache", "_transcript_cache", "rate_limiter")
+
     def __init__(self, api_key: str | None = None) -> None:
         """
         Initialize API client.
@@ -36,20 +153,196 @@ class ApiClient:
         Args:
             api_key: OpenAI API key. If None, client will be initialized later.
         """
-        self.client: OpenAI | None = None
-        if api_key:
-            self.client = OpenAI(api_key=api_key)
+        self.client: AsyncOpenAI | None = None
+        self.update_key(api_key)
         self.config = get_model_config()
+        # LRU of request hash -> corrected text
+        self._exact_cache: OrderedDict[str, str] = OrderedDict()
+        # LRU of audio hash -> transcript
+        self._transcript_cache: OrderedDict[str, str] = OrderedDict()
+        self.rate_limiter = RateLimiter(API_REQUESTS_PER_MINUTE, API_TOKENS_PER_MINUTE)
+
+    def update_key(self, api_key: str | None) -> None:
+        """
+        Switch to a new API key, keeping caches and the shared connection pool.
+
+        Args:
+            api_key: OpenAI API key. If empty, requests fail until a key is set.
+        """
+        if not api_key:
+            self.client = None
+            return
+        # Retries are handled by _execute_with_retry, not the SDK
+        self.client = AsyncOpenAI(
+            api_key=api_key, http_client=get_http_client(), max_retries=0
+        )
+
+    async def warm_up(self) -> None:
+        """Open a connection to the API host so the first request skips the TLS handshake."""
+        if not self.client:
+            return
+        try:
+            await get_http_client().head(str(self.client.base_url))
+            logger.debug("API connection warmed up")
+        except httpx.HTTPError as e:
+            logger.debug(f"API warm-up failed: {e}")
+
+    @staticmethod
+    def _cache_key(model: str, messages: list) -> str:
+        """
+        Build a cache key for a chat request.
+
+        Args:
+            model: Chat model name
+            messages: Full messages list sent to the API
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps([model, messages], ensure_ascii=False)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _transcript_key(self, audio_data: bytes) -> str:
+        """
+        Build a cache key for a transcription request.
+
+        Args:
+            audio_data: Contents of the WAV file
+
+        Returns:
+            Hex digest of the audio and the transcription settings
+        """
+        model = self.config.get("transcription_model", "whisper-1")
+        language = self.config.get("transcription_language", "ru")
+        digest = hashlib.blake2b(f"{model}\0{language}\0".encode("utf-8"), digest_size=16)
+        digest.update(audio_data)
+        return digest.hexdigest()
 
-    def _execute_with_retry(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+    def _cache_get(self, key: str, cache: OrderedDict | None = None) -> str | None:
+        """Return a cached response and mark it as recently used."""
+        cache = self._exact_cache if cache is None else cache
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+        return cached
+
+    def _cache_put(
+        self,
+        key: str,
+        content: str,
+        cache: OrderedDict | None = None,
+        max_size: int = CORRECTION_CACHE_SIZE,
+    ) -> None:
+        """Store a response, evicting the least recently used entry if full."""
+        cache = self._exact_cache if cache is None else cache
+        cache[key] = content
+        cache.move_to_end(key)
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def _estimate_tokens(messages: list) -> int:
+        """
+        Estimate prompt plus completion tokens for a chat request.
+
+        The completion is assumed to be about as long as the user message.
+
+        Args:
+            messages: Full messages list sent to the API
+
+        Returns:
+            Approximate token count
+        """
+        chars = sum(len(msg["content"]) for msg in messages)
+        chars += len(messages[-1]["content"])
+        return chars // _CHARS_PER_TOKEN + 1
+
+    @staticmethod
+    def _parse_reset(value: str) -> float | None:
         """
-        Execute a function with exponential backoff retry logic.
+        Parse an x-ratelimit-reset-* duration such as "1s", "6m0s" or "20ms".
 
-        Retries on RateLimitError and APIConnectionError with exponential backoff.
-        Other exceptions are raised immediately.
+        Args:
+            value: Header value
+
+        Returns:
+            Duration in seconds, or None if the value has no duration parts
+        """
+        parts = _RESET_PART_RE.findall(value)
+        if not parts:
+            return None
+        return sum(float(amount) * _RESET_UNIT_SECONDS[unit] for amount, unit in parts)
+
+    @classmethod
+    def _retry_after(cls, error: Exception) -> float | None:
+        """
+        Read how long to wait from the headers of an API error response.
+
+        Checks retry-after-ms, then retry-after, then the later of the
+        x-ratelimit-reset-requests and x-ratelimit-reset-tokens headers. The
+        reset headers give the time until the bucket is full again, which can
+        be minutes, so every value is capped at RETRY_MAX_DELAY.
 
         Args:
-            func: Function to execute
+            error: Exception raised by the API call
+
+        Returns:
+            Seconds to wait, or None if the server did not say
+        """
+        response = getattr(error, "response", None)
+        if response is None:
+            return None
+        try:
+            headers = response.headers
+            value = headers.get("retry-after-ms")
+            if value is not None:
+                delay = float(value) / 1000.0
+            elif (value := headers.get("retry-after")) is not None:
+                delay = float(value)
+            else:
+                resets = []
+                for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+                    value = headers.get(name)
+                    reset = cls._parse_reset(value) if value is not None else None
+                    if reset is not None:
+                        resets.append(reset)
+                if not resets:
+                    return None
+                delay = max(resets)
+        except (AttributeError, TypeError, ValueError):
+            return None
+        return min(delay, RETRY_MAX_DELAY)
+
+    def _retry_wait(self, retry_state: RetryCallState) -> float:
+        """
+        Compute the delay before the next retry attempt.
+
+        Args:
+            retry_state: Tenacity state of the failed attempt
+
+        Returns:
+            Server's Retry-After value for rate limit errors, otherwise
+            jittered exponential backoff in seconds
+        """
+        error = retry_state.outcome.exception()
+        if isinstance(error, RateLimitError):
+            retry_after = self._retry_after(error)
+            if retry_after is not None:
+                return retry_after
+        return _RETRY_BACKOFF(retry_state)
+
+    async def _execute_with_retry(
+        self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Await a coroutine function with exponential backoff retry logic.
+
+        Retries on RateLimitError and APIConnectionError with jittered
+        exponential backoff. Rate limit errors wait for the server's
+        Retry-After value when present. Other exceptions are raised immediately.
+
+        Args:
+            func: Coroutine function to execute
             *args: Positional arguments for func
             **kwargs: Keyword arguments for func
 
@@ -61,83 +354,419 @@ class ApiClient:
             APIConnectionError: If max retries exceeded
             Exception: Other exceptions are propagated
         """
-        retries = 0
-        while retries <= MAX_RETRIES:
-            try:
-                return func(*args, **kwargs)
-            except (RateLimitError, APIConnectionError) as e:
-                retries += 1
-                if retries > MAX_RETRIES:
-                    logger.error(f"Max retries exceeded for {func.__name__}: {e}")
-                    raise e
-
-                wait_time = RETRY_DELAY * (2 ** (retries - 1))
-                logger.warning(
-                    f"Network/Rate error in {func.__name__} (Attempt {retries}/{MAX_RETRIES}). Retrying in {wait_time}s..."
-                )
-                time.sleep(wait_time)
-            except Exception as e:
-                # Other errors: do not retry
-                raise e
 
-    def transcribe(self, audio_path: str) -> Tuple[str, float]:
+        def _log_retry(retry_state: RetryCallState) -> None:
+            logger.warning(
+                f"Network/Rate error in {func.__name__} (Attempt {retry_state.attempt_number}/{MAX_RETRIES}). "
+                f"Retrying in {retry_state.upcoming_sleep:.1f}s..."
+            )
+
+        retrying = AsyncRetrying(
+            retry=_RETRY_ON,
+            wait=self._retry_wait,
+            stop=_RETRY_STOP,
+            sleep=asyncio.sleep,
+            before_sleep=_log_retry,
+            reraise=True,
+        )
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    return await func(*args, **kwargs)
+        except (RateLimitError, APIConnectionError) as e:
+            logger.error(f"Max retries exceeded for {func.__name__}: {e}")
+            raise
+
+    def _audio_duration(self, audio_data: bytes) -> float:
         """
-        Transcribe audio file using OpenAI Whisper API.
+        Compute the duration of WAV data.
+
+        Reads only the canonical 44-byte PCM header written by AudioRecorder;
+        other layouts fall back to the wave module.
 
         Args:
-            audio_path: Path to WAV audio file
+            audio_data: Contents of a WAV file
 
         Returns:
-            Tuple of (Transcribed text, duration in seconds)
-            If transcription fails, returns (Error string, 0.0)
-
-        Note:
-            Returns error strings instead of raising exceptions for UI compatibility.
-            Error format: "Error: <message>"
+            Duration in seconds, or 0.0 if it cannot be determined
         """
-        model = self.config.get("transcription_model", "whisper-1")
-        language = self.config.get("transcription_language", "ru")
-
-        duration = 0.0
         try:
-            with wave.open(audio_path, "rb") as wav_file:
+            header = audio_data[:_WAV_HEADER_SIZE]
+            if (
+                len(header) == _WAV_HEADER_SIZE
+                and header[0:4] == b"RIFF"
+                and header[8:16] == b"WAVEfmt "
+                and header[36:40] == b"data"
+            ):
+                byte_rate = struct.unpack_from("<I", header, 28)[0]
+                data_size = struct.unpack_from("<I", header, 40)[0]
+                if byte_rate:
+                    return data_size / float(byte_rate)
+
+            with wave.open(io.BytesIO(audio_data), "rb") as wav_file:
                 frames = wav_file.getnframes()
                 rate = wav_file.getframerate()
-                duration = frames / float(rate)
+                return frames / float(rate)
         except Exception as e:
             logger.error(f"Error calculating audio duration: {e}")
+            return 0.0
+
+    def _transcription_error(self, error: Exception) -> str:
+        """
+        Map a transcription exception to a UI error string.
+
+        Args:
+            error: Exception raised by the transcription request
 
-        def _call_api():
+        Returns:
+            Error string in "Error: <message>" format
+        """
+        if isinstance(error, (AuthenticationError, ValueError)):
+            logger.error("Authentication failed. Check API Key.")
+            return "Error: Invalid API Key"
+        if isinstance(error, RateLimitError):
+            logger.error("Rate limit exceeded.")
+            return "Error: Rate Limit Exceeded"
+        if isinstance(error, APIConnectionError):
+            logger.error("Network connection error.")
+            return "Error: No Connection"
+        if isinstance(error, APIError):
+            logger.error(f"OpenAI API Error: {error}")
+            return "Error: API Error"
+        logger.error(f"Unexpected error during transcription: {error}", exc_info=error)
+        return "Error: Transcription Failed"
+
+    async def _load_audio(self, audio: str | bytes) -> Tuple[str, bytes, float]:
+        """
+        Get a recording's bytes once for both upload and duration.
+
+        Args:
+            audio: In-memory WAV data, or path to a WAV file
+
+        Returns:
+            Tuple of (upload file name, WAV contents, duration in seconds)
+
+        Raises:
+            ValueError: If the API key is not set
+        """
+        if not self.client:
+            raise ValueError("API Key not set")
+
+        if isinstance(audio, bytes):
+            return "audio.wav", audio, self._audio_duration(audio)
+
+        def _read_audio() -> bytes:
+            with open(audio, "rb") as audio_file:
+                return audio_file.read()
+
+        # Disk read happens off the event loop
+        audio_data = await asyncio.to_thread(_read_audio)
+        return os.path.basename(audio), audio_data, self._audio_duration(audio_data)
+
+    async def _request_transcription(
+        self, audio_name: str, audio_data: bytes, stream: bool = False
+    ) -> Any:
+        """
+        Send the audio to the transcription endpoint with retries.
+
+        Args:
+            audio_name: Upload file name
+            audio_data: Contents of the WAV file
+            stream: If True, request a stream of transcript events
+
+        Returns:
+            Transcription object, or an async event stream if stream is True
+        """
+        model = self.config.get("transcription_model", "whisper-1")
+        language = self.config.get("transcription_language", "ru")
+
+        async def _call_api():
             if not self.client:
                 raise ValueError("API Key not set")
-            with open(audio_path, "rb") as audio_file:
-                return self.client.audio.transcriptions.create(
-                    model=model, file=audio_file, language=language
-                )
+            await self.rate_limiter.acquire()
+            extra = {"stream": True} if stream else {}
+            return await self.client.audio.transcriptions.create(
+                model=model,
+                file=(audio_name, audio_data, "audio/wav"),
+                language=language,
+                **extra,
+            )
+
+        return await self._execute_with_retry(_call_api)
+
+    @staticmethod
+    def _is_silent(rms_hint: float | None) -> bool:
+        """Return True if the recording level says there is nothing to transcribe."""
+        if rms_hint is not None and rms_hint < SILENCE_RMS_THRESHOLD:
+            logger.info(f"Recording is silent (RMS {rms_hint:.1f}), skipping API call")
+            return True
+        return False
+
+    async def transcribe(
+        self, audio: str | bytes, rms_hint: float | None = None
+    ) -> Tuple[str, float]:
+        """
+        Transcribe audio using OpenAI Whisper API.
 
+        Args:
+            audio: In-memory WAV data, or path to a WAV file
+            rms_hint: RMS level of the recording; silent clips are not uploaded
+
+        Returns:
+            Tuple of (Transcribed text, billed duration in seconds)
+            Cached transcripts are not uploaded and return a duration of 0.0
+            If transcription fails, returns (Error string, 0.0)
+
+        Note:
+            Returns error strings instead of raising exceptions for UI compatibility.
+            Error format: "Error: <message>"
+        """
+        if self._is_silent(rms_hint):
+            return "", 0.0
         try:
-            transcription = self._execute_with_retry(_call_api)
+            audio_name, audio_data, duration = await self._load_audio(audio)
+            # Identical recordings are served without an upload
+            cache_key = self._transcript_key(audio_data)
+            cached = self._cache_get(cache_key, self._transcript_cache)
+            if cached is not None:
+                logger.info("Transcription served from cache")
+                return cached, 0.0
+            transcription = await self._request_transcription(audio_name, audio_data)
+            self._cache_put(
+                cache_key, transcription.text, self._transcript_cache, TRANSCRIPTION_CACHE_SIZE
+            )
             return transcription.text, duration
-        except (AuthenticationError, ValueError):
-            logger.error("Authentication failed. Check API Key.")
-            return "Error: Invalid API Key", 0.0
-        except RateLimitError:
-            logger.error("Rate limit exceeded.")
-            return "Error: Rate Limit Exceeded", 0.0
-        except APIConnectionError:
-            logger.error("Network connection error.")
-            return "Error: No Connection", 0.0
-        except APIError as e:
-            logger.error(f"OpenAI API Error: {e}")
-            return f"Error: API Error", 0.0
         except Exception as e:
-            logger.exception(f"Unexpected error during transcription: {e}")
-            return f"Error: Transcription Failed", 0.0
+            return self._transcription_error(e), 0.0
+
+    async def _transcription_deltas(
+        self, audio_name: str, audio_data: bytes, usage: dict | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Yield transcript text as it becomes available.
+
+        Models in STREAMING_TRANSCRIPTION_MODELS stream text deltas; other
+        models (e.g. whisper-1) yield the full transcript once, as does a
+        recording found in the transcript cache.
+
+        Args:
+            audio_name: Upload file name
+            audio_data: Contents of the WAV file
+            usage: If given, whisper_seconds is zeroed on a cache hit
+
+        Yields:
+            Pieces of transcript text in order
+        """
+        cache_key = self._transcript_key(audio_data)
+        cached = self._cache_get(cache_key, self._transcript_cache)
+        if cached is not None:
+            logger.info("Transcription served from cache")
+            if usage is not None:
+                usage["whisper_seconds"] = 0.0
+            yield cached
+            return
+
+        model = self.config.get("transcription_model", "whisper-1")
+        if model not in STREAMING_TRANSCRIPTION_MODELS:
+            transcription = await self._request_transcription(audio_name, audio_data)
+            parts = [transcription.text]
+            yield transcription.text
+        else:
+            parts = []
+            events = await self._request_transcription(audio_name, audio_data, stream=True)
+            async for event in events:
+                if event.type == "transcript.text.delta":
+                    parts.append(event.delta)
+                    yield event.delta
+
+        # Only complete transcripts are cached
+        self._cache_put(
+            cache_key, "".join(parts), self._transcript_cache, TRANSCRIPTION_CACHE_SIZE
+        )
+
+    async def transcribe_and_correct(
+        self,
+        audio: str | bytes,
+        previous_messages: Sequence[dict] | None = None,
+        system_prompt: str | None = None,
+        context_chars: int = 3000,
+        user_context: str = "",
+        is_translation: bool = False,
+        rms_hint: float | None = None,
+        on_partial: Callable[[str], None] | None = None,
+        on_corrected: Callable[[str], None] | None = None,
+    ) -> Tuple[str, str, dict]:
+        """
+        Transcribe audio and correct it, overlapping the two stages.
+
+        Finished sentences are handed to correct_text as soon as at least
+        STREAM_CHUNK_CHARS characters are available, so correction of early
+        text runs while later text is still being transcribed. Transcripts from
+        non-streaming models are corrected in a single call.
+
+        Args:
+            audio: In-memory WAV data, or path to a WAV file
+            previous_messages: List of previous conversation messages for context
+            system_prompt: Custom system prompt (uses default if None)
+            context_chars: Maximum context characters from history
+            user_context: Additional user-provided context
+            is_translation: If True, use translation mode instead of correction
+            rms_hint: RMS level of the recording; silent clips are not uploaded
+            on_partial: Called with the raw transcript so far each time a chunk
+                is handed to correction before transcription finishes
+            on_corrected: If given, corrections are streamed and this is called
+                with corrected text as whole sentences arrive; the pieces join
+                into the final corrected text
+
+        Returns:
+            Tuple of (raw text, corrected text, usage dictionary)
+            If transcription fails, returns ("", Error string, usage)
+            Silent recordings return ("", "", usage)
+        """
+        usage = {
+            "whisper_seconds": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+        if self._is_silent(rms_hint):
+            return "", "", usage
+        history = list(previous_messages or [])
+        chunks: asyncio.Queue[str | None] = asyncio.Queue()
+        corrected_parts: list[str] = []
+
+        async def _correct_chunks():
+            while (chunk := await chunks.get()) is not None:
+                # Earlier corrected chunks become context for the next one
+                context = history + [{"text": part} for part in corrected_parts]
+                if on_corrected is None:
+                    corrected, chunk_usage = await self.correct_text(
+                        chunk, context, system_prompt, context_chars, user_context, is_translation
+                    )
+                else:
+                    corrected, chunk_usage = await self._correct_streamed(
+                        chunk, context, system_prompt, context_chars, user_context,
+                        is_translation, on_corrected, " " if corrected_parts else "",
+                    )
+                corrected_parts.append(corrected)
+                usage["prompt_tokens"] += chunk_usage.get("prompt_tokens", 0)
+                usage["completion_tokens"] += chunk_usage.get("completion_tokens", 0)
+
+        consumer = asyncio.create_task(_correct_chunks())
+        raw_parts: list[str] = []
+        pending = ""
+        # A transcript that arrives in one piece gains nothing from splitting,
+        # only extra correction calls
+        model = self.config.get("transcription_model", "whisper-1")
+        chunked = model in STREAMING_TRANSCRIPTION_MODELS
+        try:
+            audio_name, audio_data, usage["whisper_seconds"] = await self._load_audio(audio)
+            async for delta in self._transcription_deltas(audio_name, audio_data, usage):
+                raw_parts.append(delta)
+                pending += delta
+                if chunked and len(pending) >= STREAM_CHUNK_CHARS:
+                    boundaries = list(_SENTENCE_END_RE.finditer(pending))
+                    if boundaries:
+                        split_at = boundaries[-1].end()
+                        chunks.put_nowait(pending[:split_at].strip())
+                        pending = pending[split_at:]
+                        if on_partial is not None:
+                            on_partial("".join(raw_parts).strip())
+
+            if pending.strip():
+                chunks.put_nowait(pending.strip())
+            chunks.put_nowait(None)
+            await consumer
+        except Exception as e:
+            usage["whisper_seconds"] = 0.0
+            return "", self._transcription_error(e), usage
+        finally:
+            if not consumer.done():
+                consumer.cancel()
 
-    def correct_text(
+        raw_text = "".join(raw_parts).strip()
+        if not raw_text:
+            return "", "", usage
+        return raw_text, " ".join(corrected_parts), usage
+
+    def _build_messages(
+        self,
+        previous_messages: Sequence[dict] | None,
+        system_prompt: str | None,
+        context_chars: int,
+        user_context: str,
+        is_translation: bool,
+    ) -> list:
+        """
+        Build the chat messages that precede the user text.
+
+        Args:
+            previous_messages: List of previous conversation messages for context
+            system_prompt: Custom system prompt (uses default if None)
+            context_chars: Maximum context characters from history
+            user_context: Additional user-provided context
+            is_translation: If True, use the default translation prompt
+
+        Returns:
+            List of system messages: static prompt, user context, history
+        """
+        if previous_messages is None:
+            previous_messages = []
+
+        # Default prompt if none provided
+        if not system_prompt:
+            system_prompt = (
+                DEFAULT_TRANSLATION_PROMPT
+                if is_translation
+                else DEFAULT_CORRECTION_PROMPT
+            )
+
+        # Construct context by chars. The window start only moves when the
+        # window fills up, and then drops to half of context_chars, so
+        # consecutive requests share a byte-identical history prefix that
+        # OpenAI can serve from its prompt cache.
+        cutoff = 0
+        current_length = 0
+        for msg in previous_messages:
+            current_length += len(msg["text"])
+            if current_length >= context_chars:
+                while cutoff < len(previous_messages) and current_length > context_chars // 2:
+                    current_length -= len(previous_messages[cutoff]["text"])
+                    cutoff += 1
+
+        history_text = "\n".join(
+            f"- {msg['text']}" for msg in islice(previous_messages, cutoff, None)
+        )
+
+        messages = []
+        if "{{history}}" in system_prompt:
+            # Legacy custom prompts place history inline themselves
+            messages.append(
+                {
+                    "role": "system",
+                    "content": system_prompt.replace(
+                        "{{history}}", history_text if history_text else "Нет контекста."
+                    ),
+                }
+            )
+            history_text = ""
+        else:
+            messages.append({"role": "system", "content": system_prompt})
+
+        # User context changes less often than history, so it goes first
+        if user_context:
+            messages.append(
+                {"role": "system", "content": f"[USER CONTEXT: {user_context}]"}
+            )
+        if history_text:
+            messages.append(
+                {"role": "system", "content": f"Context History:\n{history_text}"}
+            )
+        return messages
+
+    async def correct_text(
         self,
         text: str,
-        previous_messages: list | None = None,
+        previous_messages: Sequence[dict] | None = None,
         system_prompt: str | None = None,
         context_chars: int = 3000,
         user_context: str = "",
@@ -161,76 +790,442 @@ class ApiClient:
             Tuple of (Corrected/translated text, usage dictionary)
             If processing fails, returns (original text, empty dict)
         """
-        if previous_messages is None:
-            previous_messages = []
-
         model = self.config.get("correction_model", "gpt-4o-mini")
 
         try:
-            # Default prompt if none provided
-            if not system_prompt:
-                if is_translation:
-                    system_prompt = (
-                        "Ты — профессиональный переводчик. Твоя задача — перевести предоставленный текст, сохраняя смысл и учитывая контекст.\n"
-                        "### КОНТЕКСТ ДИАЛОГА:\n{{history}}\n"
-                        "### ПРАВИЛА:\n"
-                        "- Если текст на русском, переведи его на английский.\n"
-                        "- Если текст на английском, переведи его на русский.\n"
-                        "- Верни ТОЛЬКО переведенный текст."
-                    )
-                else:
-                    system_prompt = "Ты — помощник, который исправляет распознанный текст. Контекст:\n{{history}}"
+            messages = self._build_messages(
+                previous_messages, system_prompt, context_chars, user_context, is_translation
+            )
+            messages.append({"role": "user", "content": text})
 
-            # Construct context by chars
-            history_text = ""
-            current_length = 0
-
-            # Iterate backwards
-            context_messages = []
-            for msg in reversed(previous_messages):
-                msg_text = msg["text"]
-                if current_length + len(msg_text) < context_chars:
-                    context_messages.insert(0, f"- {msg_text}")
-                    current_length += len(msg_text)
-                else:
-                    break
+            # Identical requests are served without an API call
+            cache_key = self._cache_key(model, messages)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("Correction served from cache")
+                return cached, {"prompt_tokens": 0, "completion_tokens": 0}
 
-            history_text = "\n".join(context_messages)
+            estimated_tokens = self._estimate_tokens(messages)
 
-            # Use Base Prompt
-            final_system_prompt = system_prompt
-
-            # Inject History
-            if "{{history}}" in final_system_prompt:
-                final_system_prompt = final_system_prompt.replace(
-                    "{{history}}", history_text if history_text else "Нет контекста."
-                )
-            else:
-                if history_text:
-                    final_system_prompt += f"\n\nContext History:\n{history_text}"
-
-            # Inject User Context
-            if user_context:
-                final_system_prompt += f"\n\n[USER CONTEXT: {user_context}]"
-
-            messages = [
-                {"role": "system", "content": final_system_prompt},
-                {"role": "user", "content": text},
-            ]
-
-            def _call_chat():
+            async def _call_chat():
                 if not self.client:
                     raise ValueError("API Key not set")
-                return self.client.chat.completions.create(
+                await self.rate_limiter.acquire(estimated_tokens)
+                return await self.client.chat.completions.create(
                     model=model, messages=messages
                 )
 
-            response = self._execute_with_retry(_call_chat)
+            response = await self._execute_with_retry(_call_chat)
             usage = {
                 "prompt_tokens": response.usage.prompt_tokens,
                 "completion_tokens": response.usage.completion_tokens,
             }
-            return response.choices[0].message.content.strip(), usage
+            self.rate_limiter.record_usage(
+                estimated_tokens, usage["prompt_tokens"] + usage["completion_tokens"]
+            )
+            content = response.choices[0].message.content.strip()
+            self._cache_put(cache_key, content)
+            return content, usage
         except Exception as e:
             logger.exception(f"Correction error: {e}")
             return text, {}
+
+    async def correct_text_stream(
+        self,
+        text: str,
+        previous_messages: Sequence[dict] | None = None,
+        system_prompt: str | None = None,
+        context_chars: int = 3000,
+        user_context: str = "",
+        is_translation: bool = False,
+        usage: dict | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Correct or translate text, yielding the response as it streams in.
+
+        Takes the same arguments as correct_text. Cached responses are yielded
+        whole. If the request fails before any text arrives, the original
+        text is yielded instead; a failure after that is raised.
+
+        Args:
+            usage: Filled with prompt_tokens and completion_tokens when the
+                stream reports them
+
+        Yields:
+            Pieces of corrected text in order
+
+        Raises:
+            Exception: If the stream fails after text was yielded
+        """
+        model = self.config.get("correction_model", "gpt-4o-mini")
+        usage = usage if usage is not None else {}
+        messages = self._build_messages(
+            previous_messages, system_prompt, context_chars, user_context, is_translation
+        )
+        messages.append({"role": "user", "content": text})
+
+        cache_key = self._cache_key(model, messages)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info("Correction served from cache")
+            usage.update(prompt_tokens=0, completion_tokens=0)
+            yield cached
+            return
+
+        estimated_tokens = self._estimate_tokens(messages)
+
+        async def _call_chat():
+            if not self.client:
+                raise ValueError("API Key not set")
+            await self.rate_limiter.acquire(estimated_tokens)
+            return await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+
+        parts: list[str] = []
+        try:
+            # Retries cover opening the stream; text already yielded cannot be replayed
+            stream = await self._execute_with_retry(_call_chat)
+            async for event in stream:
+                if event.choices and event.choices[0].delta.content:
+                    delta = event.choices[0].delta.content
+                    parts.append(delta)
+                    yield delta
+                if event.usage:
+                    usage["prompt_tokens"] = event.usage.prompt_tokens
+                    usage["completion_tokens"] = event.usage.completion_tokens
+        except Exception as e:
+            logger.exception(f"Correction error: {e}")
+            if parts:
+                # The rest of the text is lost; surface the failure instead
+                # of passing the truncated correction off as complete
+                raise
+            yield text
+            return
+
+        if usage:
+            self.rate_limiter.record_usage(
+                estimated_tokens, usage["prompt_tokens"] + usage["completion_tokens"]
+            )
+        self._cache_put(cache_key, "".join(parts).strip())
+
+    async def _correct_streamed(
+        self,
+        text: str,
+        previous_messages: Sequence[dict],
+        system_prompt: str | None,
+        context_chars: int,
+        user_context: str,
+        is_translation: bool,
+        on_corrected: Callable[[str], None],
+        separator: str,
+    ) -> Tuple[str, dict]:
+        """
+        Stream a correction, passing on whole sentences as they complete.
+
+        Args:
+            on_corrected: Called with each completed run of sentences
+            separator: Prepended to the first piece (joins it to earlier chunks)
+
+        Returns:
+            Tuple of (corrected text, usage dictionary)
+        """
+        usage: dict = {}
+        corrected = ""
+        sent = 0
+
+        def _emit(piece: str) -> None:
+            if sent == 0:
+                piece = separator + piece.lstrip()
+            if piece.strip():
+                on_corrected(piece)
+
+        async for delta in self.correct_text_stream(
+            text, previous_messages, system_prompt, context_chars, user_context,
+            is_translation, usage=usage,
+        ):
+            corrected += delta
+            boundaries = list(_SENTENCE_END_RE.finditer(corrected, sent))
+            if boundaries:
+                end = boundaries[-1].end()
+                _emit(corrected[sent:end])
+                sent = end
+
+        _emit(corrected[sent:].rstrip())
+        return corrected.strip(), usage
+
+    async def correct_text_batch(
+        self,
+        texts: list[str],
+        previous_messages: Sequence[dict] | None = None,
+        system_prompt: str | None = None,
+        context_chars: int = 3000,
+        user_context: str = "",
+        is_translation: bool = False,
+    ) -> Tuple[list[str], dict]:
+        """
+        Correct or translate several texts with one request per batch.
+
+        Texts are packed into numbered blocks of up to CORRECTION_BATCH_SIZE
+        items so the shared system prefix is sent once per batch. Batches are
+        sent concurrently.
+
+        Args:
+            texts: Texts to process
+            previous_messages: List of previous conversation messages for context
+            system_prompt: Custom system prompt (uses default if None)
+            context_chars: Maximum context characters from history
+            user_context: Additional user-provided context
+            is_translation: If True, use translation mode instead of correction
+
+        Returns:
+            Tuple of (processed texts in input order, summed usage dictionary)
+            Items of a failed batch are returned unchanged
+        """
+        prefix = self._build_messages(
+            previous_messages, system_prompt, context_chars, user_context, is_translation
+        )
+        batches = [
+            texts[i : i + CORRECTION_BATCH_SIZE]
+            for i in range(0, len(texts), CORRECTION_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(self._correct_batch(batch, prefix) for batch in batches)
+        )
+
+        outputs: list[str] = []
+        usage = {"prompt_tokens": 0, "completion_tokens": 0}
+        for batch_outputs, batch_usage in results:
+            outputs.extend(batch_outputs)
+            for key in usage:
+                usage[key] += batch_usage.get(key, 0)
+        return outputs, usage
+
+    async def _correct_batch(self, batch: list[str], prefix: list) -> Tuple[list[str], dict]:
+        """
+        Send one packed batch and split the response into items.
+
+        Args:
+            batch: Texts in this batch
+            prefix: System messages built by _build_messages
+
+        Returns:
+            Tuple of (processed texts, usage dictionary)
+        """
+        if len(batch) == 1:
+            # Plain request keeps the output format unchanged for single items
+            messages = prefix + [{"role": "user", "content": batch[0]}]
+        else:
+            items = "\n".join(
+                f"### ITEM {i}\n{text}" for i, text in enumerate(batch, start=1)
+            )
+            messages = prefix + [
+                {"role": "system", "content": BATCH_FORMAT_PROMPT},
+                {"role": "user", "content": items},
+            ]
+
+        model = self.config.get("correction_model", "gpt-4o-mini")
+        estimated_tokens = self._estimate_tokens(messages)
+
+        async def _call_chat():
+            if not self.client:
+                raise ValueError("API Key not set")
+            await self.rate_limiter.acquire(estimated_tokens)
+            return await self.client.chat.completions.create(
+                model=model, messages=messages
+            )
+
+        try:
+            response = await self._execute_with_retry(_call_chat)
+            usage = {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+            }
+            self.rate_limiter.record_usage(
+                estimated_tokens, usage["prompt_tokens"] + usage["completion_tokens"]
+            )
+            content = response.choices[0].message.content.strip()
+            if len(batch) == 1:
+                return [content], usage
+
+            parts = [p.strip() for p in _BATCH_OUT_RE.split(content)[1:]]
+            if len(parts) != len(batch):
+                logger.warning(
+                    f"Batch response has {len(parts)} items, expected {len(batch)}"
+                )
+                return list(batch), usage
+            return parts, usage
+        except Exception as e:
+            logger.exception(f"Batch correction error: {e}")
+            return list(batch), {}
+
+    async def process_many(
+        self, requests: list[dict], max_concurrency: int = PARALLEL_REQUESTS_MAX
+    ) -> list[dict]:
+        """
+        Run many chat completion requests concurrently within rate limits.
+
+        Requests are dispatched as soon as the rate limiter has capacity, with
+        at most max_concurrency in flight. Rate limited requests are retried
+        by _execute_with_retry.
+
+        Args:
+            requests: Keyword arguments for chat.completions.create, one dict
+                per request (at least "messages"; "model" defaults to the
+                configured correction model)
+            max_concurrency: Maximum number of requests in flight
+
+        Returns:
+            One dict per request in input order, either
+            {"content": str, "usage": dict} or {"error": str}
+        """
+        if not self.client:
+            raise ValueError("API Key not set")
+
+        default_model = self.config.get("correction_model", "gpt-4o-mini")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _process(index: int, request: dict) -> dict:
+            kwargs = {"model": default_model, **request}
+            estimated_tokens = self._estimate_tokens(kwargs["messages"])
+
+            async def _call_chat():
+                await self.rate_limiter.acquire(estimated_tokens)
+                return await self.client.chat.completions.create(**kwargs)
+
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    response = await self._execute_with_retry(_call_chat)
+                except Exception as e:
+                    logger.error(f"Request {index} failed: {e}")
+                    return {"error": str(e)}
+
+            usage = {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+            }
+            self.rate_limiter.record_usage(
+                estimated_tokens, usage["prompt_tokens"] + usage["completion_tokens"]
+            )
+            logger.debug(f"Request {index} finished in {time.monotonic() - started:.2f}s")
+            return {
+                "content": response.choices[0].message.content.strip(),
+                "usage": usage,
+            }
+
+        return await asyncio.gather(
+            *(_process(i, request) for i, request in enumerate(requests))
+        )
+
+    async def submit_batch(
+        self,
+        texts: dict[str, str],
+        system_prompt: str | None = None,
+        user_context: str = "",
+        is_translation: bool = False,
+    ) -> str:
+        """
+        Submit texts to the OpenAI Batch API for offline processing.
+
+        Batch jobs cost half the price of regular requests and do not count
+        against per-minute rate limits, but complete within 24 hours. Use this
+        for bulk reprocessing, not for live dictation.
+
+        Args:
+            texts: Mapping of custom id to text to process
+            system_prompt: Custom system prompt (uses default if None)
+            user_context: Additional user-provided context
+            is_translation: If True, use translation mode instead of correction
+
+        Returns:
+            Batch job id for poll_batch
+
+        Raises:
+            ValueError: If the API key is not set
+        """
+        if not self.client:
+            raise ValueError("API Key not set")
+
+        model = self.config.get("correction_model", "gpt-4o-mini")
+        prefix = self._build_messages(None, system_prompt, 0, user_context, is_translation)
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": model,
+                        "messages": prefix + [{"role": "user", "content": text}],
+                    },
+                },
+                ensure_ascii=False,
+            )
+            for custom_id, text in texts.items()
+        ]
+        payload = "\n".join(lines).encode("utf-8")
+
+        input_file = await self._execute_with_retry(
+            self.client.files.create, file=("batch.jsonl", payload), purpose="batch"
+        )
+        batch = await self._execute_with_retry(
+            self.client.batches.create,
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(lines)} requests")
+        return batch.id
+
+    async def poll_batch(self, batch_id: str) -> dict[str, str]:
+        """
+        Wait for a batch job and collect its results.
+
+        Polls with exponential backoff between BATCH_POLL_INTERVAL and
+        BATCH_POLL_MAX_INTERVAL seconds.
+
+        Args:
+            batch_id: Id returned by submit_batch
+
+        Returns:
+            Mapping of custom id to processed text. Failed requests are
+            omitted; an empty dict is returned if the batch did not complete.
+
+        Raises:
+            ValueError: If the API key is not set
+        """
+        if not self.client:
+            raise ValueError("API Key not set")
+
+        interval = BATCH_POLL_INTERVAL
+        while True:
+            batch = await self._execute_with_retry(self.client.batches.retrieve, batch_id)
+            if batch.status in ("completed", "failed", "expired", "cancelled"):
+                break
+            logger.debug(f"Batch {batch_id} is {batch.status}, next check in {interval}s")
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, BATCH_POLL_MAX_INTERVAL)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Batch {batch_id} finished with status {batch.status}")
+            return {}
+
+        content = await self._execute_with_retry(
+            self.client.files.content, batch.output_file_id
+        )
+        results = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.warning(f"Batch request {record.get('custom_id')} failed")
+                continue
+            message = response["body"]["choices"][0]["message"]["content"]
+            results[record["custom_id"]] = message.strip()
+        return results
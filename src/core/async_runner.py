@@ -0,0 +1,68 @@
+"""
+Background asyncio event loop for API coroutines.
+
+This module provides a persistent event loop running in a daemon thread, so
+async API clients keep their connection pools alive between requests while the
+Qt event loop stays responsive.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Coroutine
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRunner:
+    """
+    Runs coroutines on a long-lived event loop in a background thread.
+
+    Coroutines are submitted from any thread and return
+    concurrent.futures.Future objects that can be waited on or cancelled.
+    """
+
+    def __init__(self) -> None:
+        """Create the event loop and start its thread."""
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self._run_loop, name="sflow-async", daemon=True
+        )
+        self.thread.start()
+
+    def _run_loop(self) -> None:
+        """Thread target: run the event loop until stopped."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the background loop.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Future resolved with the coroutine result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine) -> Any:
+        """
+        Run a coroutine on the background loop and block until it finishes.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Result of the coroutine
+        """
+        return self.submit(coro).result()
+
+    def stop(self) -> None:
+        """Stop the event loop and wait for its thread to exit."""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=2.0)
+        logger.debug("Async runner stopped")
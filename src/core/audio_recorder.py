@@ -2,74 +2,133 @@
 Audio Recorder module for capturing microphone input.
 
 This module provides functionality to record audio from the default microphone
-and save it to temporary WAV files for transcription.
+and encode it as in-memory WAV data for transcription.
 """
 
-import sounddevice as sd
 import numpy as np
-import scipy.io.wavfile as wav
-import tempfile
-import threading
-import os
 import logging
-import queue
+import struct
+import threading
+
+from .config import RECORDING_BUFFER_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# sounddevice loads PortAudio on import, so it is imported on first recording
+sd = None
+
+
+def _load_sounddevice():
+    """Import sounddevice once and return the module."""
+    global sd
+    if sd is None:
+        import sounddevice
+
+        sd = sounddevice
+    return sd
+
+# Canonical 44-byte RIFF/WAVE header for PCM data
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+def _encode_wav(sample_rate: int, pcm: np.ndarray) -> bytes:
+    """
+    Encode int16 PCM samples as WAV file contents.
+
+    Args:
+        sample_rate: Sample rate in Hz
+        pcm: C-contiguous int16 array of shape (frames, channels)
+
+    Returns:
+        Complete WAV file as bytes
+    """
+    channels = pcm.shape[1]
+    sample_width = pcm.dtype.itemsize
+    block_align = channels * sample_width
+    header = _WAV_HEADER.pack(
+        b"RIFF",
+        36 + pcm.nbytes,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # PCM
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        sample_width * 8,
+        b"data",
+        pcm.nbytes,
+    )
+    # Byte view of the samples: the join is the only copy
+    return b"".join((header, memoryview(pcm).cast("B")))
+
 
 class AudioRecorder:
     """
-    Records audio from the default microphone to temporary WAV files.
+    Records audio from the default microphone as in-memory WAV data.
 
     Uses sounddevice for audio capture with callback-based streaming.
-    Audio data is buffered in a queue and saved on stop_recording().
+    Audio data is copied into a preallocated buffer and encoded as WAV on
+    stop_recording(); nothing is written to disk.
     """
 
-    def __init__(self, sample_rate: int = 44100, channels: int = 1) -> None:
+    __slots__ = (
+        "sample_rate", "channels", "_recording", "_buffer",
+        "_frames_written", "last_rms", "stream",
+    )
+
+    def __init__(
+        self,
+        sample_rate: int = 44100,
+        channels: int = 1,
+        buffer_seconds: int = RECORDING_BUFFER_SECONDS,
+    ) -> None:
         """
         Initialize audio recorder.
 
         Args:
             sample_rate: Sample rate in Hz (default: 44100)
             channels: Number of audio channels (default: 1 for mono)
+            buffer_seconds: Initial buffer length; grows for longer recordings
         """
         self.sample_rate = sample_rate
         self.channels = channels
-        self.recording = False
-        self.audio_queue = queue.Queue()
+        self._recording = threading.Event()
+        # Reused across recordings; the callback copies blocks straight in
+        self._buffer = np.empty((sample_rate * buffer_seconds, channels), dtype=np.int16)
+        self._frames_written = 0
+        self.last_rms = 0.0  # RMS level of the last stopped recording
         self.stream = None
-        self.filename = None
-        self.temp_files = []  # Track created temp files for cleanup
-
-    def cleanup(self) -> None:
-        """Remove all temporary audio files created during recording sessions."""
-        for path in self.temp_files:
-            try:
-                if os.path.exists(path):
-                    os.unlink(path)
-                    logger.debug(f"Cleaned up temp file: {path}")
-            except Exception as e:
-                logger.warning(f"Failed to delete temp file {path}: {e}")
-        self.temp_files.clear()
+
+    @property
+    def recording(self) -> bool:
+        """Whether the input stream is currently capturing audio."""
+        return self._recording.is_set()
 
     def start_recording(self) -> None:
         """Start recording audio from the default microphone."""
         if self.recording:
             return
 
-        self.recording = True
-        # Clear existing queue instead of creating new one
-        while not self.audio_queue.empty():
-            self.audio_queue.get()
+        self._recording.set()
+        self._frames_written = 0
 
         def callback(indata, frames, time, status):
             """Audio callback for sounddevice streaming."""
             if status:
                 logger.warning(f"Audio recording status: {status}")
-            self.audio_queue.put(indata.copy())
+            # Single writer, and the buffer is only read after the stream is
+            # stopped, so no lock: the real-time thread just copies samples
+            start = self._frames_written
+            end = start + frames
+            if end > len(self._buffer):
+                self._grow_buffer(end)
+            np.copyto(self._buffer[start:end], indata)
+            self._frames_written = end
 
         try:
-            self.stream = sd.InputStream(
+            self.stream = _load_sounddevice().InputStream(
                 samplerate=self.sample_rate,
                 channels=self.channels,
                 dtype="int16",
@@ -79,50 +138,44 @@ class AudioRecorder:
             logger.info("Recording started...")
         except Exception as e:
             logger.error(f"Failed to start recording: {e}")
-            self.recording = False
+            self._recording.clear()
 
-    def stop_recording(self) -> str | None:
+    def _grow_buffer(self, min_frames: int) -> None:
         """
-        Stop recording and save audio to a temporary WAV file.
+        Double the buffer until it holds min_frames, keeping recorded audio.
+
+        Args:
+            min_frames: Number of frames the buffer must hold
+        """
+        capacity = max(len(self._buffer), 1)
+        while capacity < min_frames:
+            capacity *= 2
+        grown = np.empty((capacity, self.channels), dtype=self._buffer.dtype)
+        grown[: self._frames_written] = self._buffer[: self._frames_written]
+        self._buffer = grown
+
+    def stop_recording(self) -> bytes | None:
+        """
+        Stop recording and return the audio as WAV file contents.
 
         Returns:
-            Path to the temporary WAV file, or None if no data was recorded
+            WAV data, or None if nothing was recorded
         """
         if not self.recording or not self.stream:
             return None
 
-        self.recording = False
+        self._recording.clear()
         self.stream.stop()
         self.stream.close()
         logger.info("Recording stopped.")
 
-        return self._save_from_queue()
-
-    def _save_from_queue(self) -> str | None:
-        """
-        Save queued audio data to a temporary WAV file.
-
-        Returns:
-            Path to the temporary WAV file, or None if saving failed
-        """
-        frames = []
-        while not self.audio_queue.empty():
-            frames.append(self.audio_queue.get())
-
-        if not frames:
+        # The stream is stopped, so the write index is final
+        frames_written = self._frames_written
+        if not frames_written:
             logger.warning("No audio data recorded.")
             return None
 
-        recording = np.concatenate(frames, axis=0)
-
-        # Create temp file
-        try:
-            fd, path = tempfile.mkstemp(suffix=".wav")
-            os.close(fd)
-            wav.write(path, self.sample_rate, recording)
-            self.temp_files.append(path)  # Track for cleanup
-            logger.info(f"Audio saved to {path}")
-            return path
-        except Exception as e:
-            logger.error(f"Failed to save audio file: {e}")
-            return None
+        # View into the buffer, no concatenation copy
+        recording = self._buffer[:frames_written]
+        self.last_rms = float(np.sqrt(np.mean(np.square(recording, dtype=np.int64))))
+        return _encode_wav(self.sample_rate, recording)
@@ -1,68 +1,241 @@
 import os
 import json
 import sys
+import atexit
+import functools
 import logging
+import logging.handlers
+import queue
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib serializer
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+# Resolved once at import; the location cannot change while running
+if getattr(sys, "frozen", False):
+    _APP_DIR = Path(sys.executable).parent
+    # PyInstaller creates a temp folder and stores path in _MEIPASS
+    _RESOURCE_DIR = Path(sys._MEIPASS)
+else:
+    _APP_DIR = Path(__file__).parents[2]
+    _RESOURCE_DIR = _APP_DIR
+
+
 def get_app_dir():
     """Returns the directory where the executable or script is located."""
-    if getattr(sys, "frozen", False):
-        return os.path.dirname(sys.executable)
-    return os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    return str(_APP_DIR)
 
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller."""
-    if getattr(sys, "frozen", False):
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    return os.path.join(base_path, relative_path)
+    return str(_RESOURCE_DIR / relative_path)
 
 
-SETTINGS_PATH = os.path.join(get_app_dir(), "settings.json")
-LOG_PATH = os.path.join(get_app_dir(), "app.log")
+SETTINGS_PATH = str(_APP_DIR / "settings.json")
+LOG_PATH = str(_APP_DIR / "app.log")
+# QLockFile of the running instance; the file outlives a crash and is detected as
+# stale from the PID and hostname it records
+LOCK_PATH = str(_APP_DIR / "s-flow.lock")
 APP_VERSION = "1.9.0"
 
+# Whisper resamples to 16 kHz, so recording at a higher rate only adds upload bytes
+RECORDING_SAMPLE_RATE = 16000
+
+# Recordings with int16 RMS below this are treated as silence and not uploaded
+SILENCE_RMS_THRESHOLD = 50.0
+
+# Initial AudioRecorder buffer length (seconds); doubled when a recording outgrows it
+RECORDING_BUFFER_SECONDS = 60
+
 # Retry Configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+# Shared HTTP connection pool for API clients
+HTTP_TIMEOUT = 60.0
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_MAX_CONNECTIONS = 64
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
+
+# Client-side rate limits (match the account tier to avoid 429 responses)
+API_REQUESTS_PER_MINUTE = 500
+API_TOKENS_PER_MINUTE = 200000
+
+# Maximum number of cached correction responses
+CORRECTION_CACHE_SIZE = 1000
+
+# Maximum number of cached transcripts, keyed by a hash of the recording
+TRANSCRIPTION_CACHE_SIZE = 32
+
+# Maximum number of texts packed into one batched correction request
+CORRECTION_BATCH_SIZE = 10
+
+# Minimum transcript length handed to correction while streaming
+STREAM_CHUNK_CHARS = 200
+
+# Maximum concurrent requests in ApiClient.process_many
+PARALLEL_REQUESTS_MAX = 8
+
+# Batch API polling interval bounds (seconds)
+BATCH_POLL_INTERVAL = 10.0
+BATCH_POLL_MAX_INTERVAL = 300.0
+
+# Characters of the partial transcript shown in the overlay while processing
+OVERLAY_PARTIAL_CHARS = 60
+
+# Corrected messages kept as correction context; older ones fall off the history
+HISTORY_MAX_MESSAGES = 64
+
+# Update download read/write chunk size (bytes)
+UPDATE_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Keep-alive pool for GitHub release checks and downloads
+UPDATE_MAX_KEEPALIVE_CONNECTIONS = 4
+UPDATE_KEEPALIVE_EXPIRY = 30.0
+
+# Longest wait for the clipboard to take pasted text, and the poll step (seconds)
+PASTE_CLIPBOARD_TIMEOUT = 0.2
+PASTE_POLL_INTERVAL = 0.002
+
+# Single-line text up to this length is typed with SendInput instead of pasted
+PASTE_UNICODE_MAX_CHARS = 500
+
+# Background listener writing queued log records, started by setup_logging()
+_log_listener = None
+
+# Parsed settings.json and the modification time it was read at
+_settings_cache = {"mtime": None, "data": {}}
 
 
 def setup_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(LOG_PATH, encoding="utf-8"),
-            logging.StreamHandler(),
-        ],
+    """
+    Routes log records through a queue to a background listener thread.
+
+    Callers (including the audio callback) only enqueue records; the listener
+    writes them to app.log as they arrive, so the file stays current and
+    nothing is lost if the process is killed.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    file_handler = logging.FileHandler(LOG_PATH, encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
     )
+    _log_listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Drains the log queue and closes the log file."""
+    global _log_listener
+    if _log_listener is None:
+        return
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        handler.close()
+    _log_listener = None
+
+
+def read_json_file(path):
+    """Parses a JSON file from raw bytes; raises FileNotFoundError if missing."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
 
 
 def load_settings():
+    """Returns a copy of settings.json, re-parsed only when the file changes."""
     try:
-        if os.path.exists(SETTINGS_PATH):
-            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
+        mtime = os.stat(SETTINGS_PATH).st_mtime_ns
+        if mtime != _settings_cache["mtime"]:
+            _settings_cache["data"] = read_json_file(SETTINGS_PATH)
+            _settings_cache["mtime"] = mtime
+        # Callers modify their settings dict before saving it
+        return dict(_settings_cache["data"])
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logger.error(f"Error loading settings: {e}")
     return {}
 
 
+def _clear_settings_cache():
+    """Forgets the parsed settings so the next load_settings() reads the file."""
+    _settings_cache["mtime"] = None
+    _settings_cache["data"] = {}
+
+
+# Same reset hook as functools caches, for tests and external edits
+load_settings.cache_clear = _clear_settings_cache
+
+
+def _dump_json(data):
+    """Serializes data as indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _write_bytes_atomic(path, payload):
+    """Writes bytes to path via a temporary file and os.replace."""
+    # A crash mid-write leaves the old file intact instead of a truncated one
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def write_json_file(path, data):
+    """Writes data as indented UTF-8 JSON, replacing the file atomically."""
+    _write_bytes_atomic(path, _dump_json(data))
+
+
 def save_settings_file(settings):
     try:
-        with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-            json.dump(settings, f, indent=4, ensure_ascii=False)
+        payload = _dump_json(settings)
+        # Saving the dialog without changes should not touch the disk
+        try:
+            with open(SETTINGS_PATH, "rb") as f:
+                if f.read() == payload:
+                    logger.debug("Settings unchanged, skipping write")
+                    return True
+        except FileNotFoundError:
+            pass
+        _write_bytes_atomic(SETTINGS_PATH, payload)
+        # The next load_settings() can use what was just written without parsing
+        _settings_cache["data"] = dict(settings)
+        _settings_cache["mtime"] = os.stat(SETTINGS_PATH).st_mtime_ns
         return True
     except Exception as e:
         logger.error(f"Error saving settings: {e}")
         return False
 
 
+def update_settings(changes):
+    """Merges changes into settings.json, keeping keys written by other components."""
+    settings = load_settings()
+    settings.update(changes)
+    return save_settings_file(settings)
+
+
 def get_openai_key():
     key = os.getenv("OPENAI_API_KEY")
     if not key:
@@ -70,14 +243,44 @@ def get_openai_key():
     return key
 
 
+# Model settings and their defaults, in the order get_model_config returns them
+_MODEL_DEFAULTS = {
+    "transcription_model": "whisper-1",
+    "correction_model": "gpt-4o-mini",
+    "transcription_language": "ru",
+}
+
+
 def get_model_config(settings=None):
     if settings is None:
         settings = load_settings()
-    return {
-        "transcription_model": settings.get("transcription_model", "whisper-1"),
-        "correction_model": settings.get("correction_model", "gpt-4o-mini"),
-        "transcription_language": settings.get("transcription_language", "ru"),
-    }
+    return {key: settings.get(key, default) for key, default in _MODEL_DEFAULTS.items()}
+
+
+@functools.cache
+def _resolve_app_path():
+    """Returns the quoted startup command for this install (resolved once)."""
+    root_dir = get_app_dir()
+
+    if getattr(sys, "frozen", False):
+        # We are running as an EXE
+        return f'"{sys.executable}"'
+
+    # We are running as Python script.
+    # But if the user wants the "EXE" to start, we look for it.
+    potential_exe_dist = os.path.join(root_dir, "dist", "S-Flow.exe")
+    potential_exe_root = os.path.join(root_dir, "S-Flow.exe")
+
+    if os.path.exists(potential_exe_dist):
+        return f'"{potential_exe_dist}"'
+    if os.path.exists(potential_exe_root):
+        return f'"{potential_exe_root}"'
+
+    # Fallback to current python command if no EXE found
+    main_script = os.path.join(root_dir, "src", "main.py")
+    if os.path.exists(main_script):
+        return f'"{sys.executable}" "{main_script}"'
+    return f'"{sys.executable}" "{os.path.abspath(sys.argv[0])}"'
 
 
 def set_autostart(enabled: bool):
@@ -85,45 +288,22 @@ def set_autostart(enabled: bool):
     import winreg
 
     app_name = "S-Flow"
-
-    root_dir = get_app_dir()
-
-    if getattr(sys, "frozen", False):
-        # We are running as an EXE
-        app_path = f'"{sys.executable}"'
-    else:
-        # We are running as Python script.
-        # But if the user wants the "EXE" to start, we look for it.
-        potential_exe_dist = os.path.join(root_dir, "dist", "S-Flow.exe")
-        potential_exe_root = os.path.join(root_dir, "S-Flow.exe")
-
-        if os.path.exists(potential_exe_dist):
-            app_path = f'"{potential_exe_dist}"'
-        elif os.path.exists(potential_exe_root):
-            app_path = f'"{potential_exe_root}"'
-        else:
-            # Fallback to current python command if no EXE found
-            main_script = os.path.join(root_dir, "src", "main.py")
-            if os.path.exists(main_script):
-                app_path = f'"{sys.executable}" "{main_script}"'
-            else:
-                app_path = f'"{sys.executable}" "{os.path.abspath(sys.argv[0])}"'
+    app_path = _resolve_app_path()
 
     key_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
     try:
-        key = winreg.OpenKey(
+        with winreg.OpenKey(
             winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE
-        )
-        if enabled:
-            winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, app_path)
-            logging.info(f"Autostart enabled: {app_path}")
-        else:
-            try:
-                winreg.DeleteValue(key, app_name)
-                logging.info("Autostart disabled")
-            except FileNotFoundError:
-                pass
-        winreg.CloseKey(key)
+        ) as key:
+            if enabled:
+                winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, app_path)
+                logging.info(f"Autostart enabled: {app_path}")
+            else:
+                try:
+                    winreg.DeleteValue(key, app_name)
+                    logging.info("Autostart disabled")
+                except FileNotFoundError:
+                    pass
         return True
     except Exception as e:
         logging.error(f"Error updating registry for autostart: {e}")
@@ -9,6 +9,8 @@ and logging throughout the application.
 class SFlowError(Exception):
     """Base exception for S-Flow application errors."""
 
+    __slots__ = ("_user_message",)
+
     def __init__(self, message: str, user_message: str | None = None) -> None:
         """
         Initialize S-Flow error.
@@ -18,12 +20,19 @@ class SFlowError(Exception):
             user_message: User-friendly message to display in UI (optional)
         """
         super().__init__(message)
-        self.user_message = user_message or message
+        self._user_message = user_message
+
+    @property
+    def user_message(self) -> str:
+        """User-friendly message to display in UI."""
+        return self._user_message or self.args[0]
 
 
 class AuthenticationError(SFlowError):
     """Raised when API authentication fails."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Invalid API Key") -> None:
         super().__init__(message, user_message="Error: Invalid API Key")
 
@@ -31,6 +40,8 @@ class AuthenticationError(SFlowError):
 class TranscriptionError(SFlowError):
     """Raised when audio transcription fails."""
 
+    __slots__ = ()
+
     def __init__(self, message: str) -> None:
         super().__init__(message, user_message="Error: Transcription Failed")
 
@@ -38,6 +49,8 @@ class TranscriptionError(SFlowError):
 class APIConnectionError(SFlowError):
     """Raised when API network connection fails."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Network connection error") -> None:
         super().__init__(message, user_message="Error: No Connection")
 
@@ -45,6 +58,8 @@ class APIConnectionError(SFlowError):
 class RateLimitError(SFlowError):
     """Raised when API rate limit is exceeded."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Rate limit exceeded") -> None:
         super().__init__(message, user_message="Error: Rate Limit Exceeded")
 
@@ -52,6 +67,8 @@ class RateLimitError(SFlowError):
 class AudioRecordingError(SFlowError):
     """Raised when audio recording fails."""
 
+    __slots__ = ()
+
     def __init__(self, message: str) -> None:
         super().__init__(message, user_message="Error: Audio recording failed")
 
@@ -59,12 +76,21 @@ class AudioRecordingError(SFlowError):
 class ConfigurationError(SFlowError):
     """Raised when configuration is invalid."""
 
+    __slots__ = ()
+
     def __init__(self, message: str) -> None:
-        super().__init__(message, user_message=f"Error: {message}")
+        super().__init__(message)
+
+    @property
+    def user_message(self) -> str:
+        """User-friendly message, formatted only when displayed."""
+        return f"Error: {self.args[0]}"
 
 
 class HotkeyError(SFlowError):
     """Raised when hotkey operations fail."""
 
+    __slots__ = ()
+
     def __init__(self, message: str) -> None:
         super().__init__(message, user_message="Error: Hotkey operation failed")
@@ -2,22 +2,49 @@
 Hotkey Controller for managing multiple hotkeys with batch operations.
 
 This module provides a centralized controller for managing multiple hotkeys
-with consistent start/stop behavior and simplified API.
+with consistent start/stop behavior and simplified API. All hotkeys share a
+single keyboard hook and are matched against the set of pressed keys.
 """
 
 import logging
-from typing import Callable
+from enum import IntEnum
 from PyQt6.QtCore import QObject, pyqtSignal
 
-from .hotkey_manager import HotkeyManager
-
 logger = logging.getLogger(__name__)
 
+# keyboard sets up its platform backend on import, so it is imported on first start_all()
+keyboard = None
+
+
+def _load_keyboard():
+    """Import keyboard once and return the module."""
+    global keyboard
+    if keyboard is None:
+        import keyboard as keyboard_module
+
+        keyboard = keyboard_module
+    return keyboard
+
+
+class HotkeyType(IntEnum):
+    """Hotkey kinds; values index HotkeyController's manager tuple."""
+
+    ACTIVATION = 0
+    TRANSLATION = 1
+    CANCEL = 2
+
+
+# Legacy string names accepted by update_hotkey/get_hotkey
+_TYPE_BY_NAME = {hotkey_type.name.lower(): hotkey_type for hotkey_type in HotkeyType}
+
 
 class HotkeyController(QObject):
     """
     Manages multiple hotkeys with batch operations.
 
+    One low-level keyboard hook tracks pressed keys; a combination fires when
+    the pressed set equals one of the registered hotkeys.
+
     Attributes:
         triggered_activation: Signal emitted when activation hotkey is pressed
         triggered_translation: Signal emitted when translation hotkey is pressed
@@ -39,84 +66,180 @@ class HotkeyController(QObject):
         """
         super().__init__()
 
-        # Create individual hotkey managers
-        self.managers = {
-            "activation": HotkeyManager(settings.get("hotkey", "ctrl+alt+s")),
-            "translation": HotkeyManager(
-                settings.get("translation_hotkey", "ctrl+alt+t")
-            ),
-            "cancel": HotkeyManager(settings.get("cancel_hotkey", "ctrl+alt+x")),
-        }
+        # Key combinations and their signals, in HotkeyType order
+        self.combinations = [
+            settings.get("hotkey", "ctrl+alt+s"),
+            settings.get("translation_hotkey", "ctrl+alt+t"),
+            settings.get("cancel_hotkey", "ctrl+alt+x"),
+        ]
+        self._signals = (
+            self.triggered_activation,
+            self.triggered_translation,
+            self.triggered_cancel,
+        )
 
-        # Connect signals
-        self.managers["activation"].triggered.connect(self.triggered_activation.emit)
-        self.managers["translation"].triggered.connect(self.triggered_translation.emit)
-        self.managers["cancel"].triggered.connect(self.triggered_cancel.emit)
+        self._hook = None
+        self._combo_map = {}  # frozenset of scan codes -> HotkeyType
+        self._scan_alias = {}  # scan code -> canonical scan code of the same key
+        self._pressed = set()
+        self._fired = None  # Combination already emitted for the held keys
 
         logger.info(
             f"HotkeyController initialized with settings: {settings.get('hotkey')}, "
             f"{settings.get('translation_hotkey')}, {settings.get('cancel_hotkey')}"
         )
 
-    def start_all(self) -> None:
-        """Start all hotkey listeners."""
-        for name, manager in self.managers.items():
+    @staticmethod
+    def _resolve_type(hotkey_type: HotkeyType | str) -> HotkeyType | None:
+        """
+        Convert a legacy string name to a HotkeyType.
+
+        Args:
+            hotkey_type: HotkeyType or 'activation', 'translation', 'cancel'
+
+        Returns:
+            Matching HotkeyType, or None if unknown
+        """
+        if isinstance(hotkey_type, HotkeyType):
+            return hotkey_type
+        return _TYPE_BY_NAME.get(hotkey_type)
+
+    def _build_map(self, combinations: list[str]) -> tuple[dict, dict]:
+        """
+        Parse combinations into scan-code sets for dispatch.
+
+        Keys with several scan codes (e.g. left/right ctrl) are folded onto the
+        first one, so either variant matches. Empty or unparsable combinations
+        are skipped so the remaining hotkeys still register.
+
+        Args:
+            combinations: Key combination strings in HotkeyType order
+
+        Returns:
+            Tuple of (combination map, scan code aliases)
+        """
+        keyboard = _load_keyboard()
+        combo_map = {}
+        scan_alias = {}
+        for hotkey_type, combination in zip(HotkeyType, combinations):
+            name = hotkey_type.name.lower()
+            if not combination:
+                logger.warning(f"No {name} hotkey set, skipping it")
+                continue
             try:
-                manager.start()
-                logger.debug(f"Started hotkey manager: {name}")
+                # Only single-step combinations are supported; use the first step
+                step = keyboard.parse_hotkey(combination)[0]
             except Exception as e:
-                logger.error(f"Failed to start hotkey manager {name}: {e}")
+                logger.warning(f"Invalid {name} hotkey {combination!r}, skipping it: {e}")
+                continue
+
+            aliases = {}
+            canonical = []
+            for scan_codes in step:
+                canonical.append(scan_codes[0])
+                for scan_code in scan_codes:
+                    aliases[scan_code] = scan_codes[0]
+            key = frozenset(canonical)
+            if key in combo_map:
+                logger.warning(
+                    f"{name.capitalize()} hotkey {combination!r} is already used by the "
+                    f"{combo_map[key].name.lower()} hotkey, skipping it"
+                )
+                continue
+            scan_alias.update(aliases)
+            combo_map[key] = hotkey_type
+        return combo_map, scan_alias
+
+    def _on_event(self, event) -> None:
+        """
+        Keyboard hook callback: track pressed keys and emit matching hotkeys.
+
+        Args:
+            event: keyboard.KeyboardEvent
+        """
+        scan_code = self._scan_alias.get(event.scan_code, event.scan_code)
+        if event.event_type == _load_keyboard().KEY_UP:
+            self._pressed.discard(scan_code)
+            self._fired = None
+            return
+
+        self._pressed.add(scan_code)
+        hotkey_type = self._combo_map.get(frozenset(self._pressed))
+        # Auto-repeat keeps sending key-down events; emit once per press
+        if hotkey_type is not None and hotkey_type is not self._fired:
+            self._fired = hotkey_type
+            logger.info(f"Hotkey {self.combinations[hotkey_type]} triggered")
+            self._signals[hotkey_type].emit()
+
+    def start_all(self) -> None:
+        """Start listening for all hotkeys."""
+        if self._hook is not None:
+            return
+        try:
+            self._combo_map, self._scan_alias = self._build_map(self.combinations)
+            self._hook = _load_keyboard().hook(self._on_event)
+            logger.debug("Started hotkey hook")
+        except Exception as e:
+            logger.error(f"Failed to start hotkey hook: {e}")
 
     def stop_all(self) -> None:
-        """Stop all hotkey listeners."""
-        for name, manager in self.managers.items():
-            try:
-                manager.stop()
-                logger.debug(f"Stopped hotkey manager: {name}")
-            except Exception as e:
-                logger.error(f"Failed to stop hotkey manager {name}: {e}")
+        """Stop listening for all hotkeys."""
+        if self._hook is None:
+            return
+        try:
+            _load_keyboard().unhook(self._hook)
+            logger.debug("Stopped hotkey hook")
+        except Exception as e:
+            logger.error(f"Failed to stop hotkey hook: {e}")
+        self._hook = None
+        self._pressed.clear()
+        self._fired = None
 
-    def update_hotkey(self, hotkey_type: str, new_combination: str) -> bool:
+    def update_hotkey(self, hotkey_type: HotkeyType | str, new_combination: str) -> bool:
         """
         Update a specific hotkey combination.
 
         Args:
-            hotkey_type: Type of hotkey ('activation', 'translation', or 'cancel')
+            hotkey_type: HotkeyType, or its name ('activation', 'translation', 'cancel')
             new_combination: New key combination string (e.g., 'ctrl+alt+a')
 
         Returns:
             True if update succeeded, False otherwise
         """
-        if hotkey_type not in self.managers:
+        resolved = self._resolve_type(hotkey_type)
+        if resolved is None:
             logger.error(f"Unknown hotkey type: {hotkey_type}")
             return False
 
-        manager = self.managers[hotkey_type]
-        if manager.combination == new_combination:
+        if self.combinations[resolved] == new_combination:
             return True  # No change needed
 
+        combinations = list(self.combinations)
+        combinations[resolved] = new_combination
         try:
-            manager.stop()
-            manager.combination = new_combination
-            manager.start()
-            logger.info(f"Updated {hotkey_type} hotkey to: {new_combination}")
+            # The running hook picks up the new map on its next event
+            if self._hook is not None:
+                self._combo_map, self._scan_alias = self._build_map(combinations)
+            self.combinations = combinations
+            logger.info(f"Updated {resolved.name.lower()} hotkey to: {new_combination}")
             return True
         except Exception as e:
-            logger.error(f"Failed to update {hotkey_type} hotkey: {e}")
+            logger.error(f"Failed to update {resolved.name.lower()} hotkey: {e}")
             return False
 
-    def get_hotkey(self, hotkey_type: str) -> str:
+    def get_hotkey(self, hotkey_type: HotkeyType | str) -> str:
         """
         Get current hotkey combination for a specific type.
 
         Args:
-            hotkey_type: Type of hotkey ('activation', 'translation', or 'cancel')
+            hotkey_type: HotkeyType, or its name ('activation', 'translation', 'cancel')
 
         Returns:
             Current key combination string
         """
-        if hotkey_type not in self.managers:
+        resolved = self._resolve_type(hotkey_type)
+        if resolved is None:
             logger.warning(f"Unknown hotkey type: {hotkey_type}")
             return ""
 
-        return self.managers[hotkey_type].combination
+        return self.combinations[resolved]
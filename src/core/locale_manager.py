@@ -5,8 +5,8 @@ This module provides translation functionality with support for multiple languag
 Uses JSON files for translations and provides fallback to key if translation not found.
 """
 
-import json
 import os
+import sys
 import logging
 from .config import load_settings
 
@@ -28,6 +28,8 @@ class LocaleManager:
             cls._instance = super(LocaleManager, cls).__new__(cls)
             cls._instance.translations = {}
             cls._instance.current_lang = "ru"
+            # lang code -> (locale file mtime, interned translations)
+            cls._instance._locale_cache = {}
             cls._instance.load_locale("ru")
         return cls._instance
 
@@ -40,19 +42,29 @@ class LocaleManager:
         """
         self.current_lang = lang_code
         try:
-            from .config import get_resource_path
+            from .config import get_resource_path, read_json_file
 
             locale_path = get_resource_path(
                 os.path.join("assets", "locales", f"{lang_code}.json")
             )
-            if os.path.exists(locale_path):
-                with open(locale_path, "r", encoding="utf-8") as f:
-                    self.translations = json.load(f)
-                logger.info(f"Loaded locale: {lang_code}")
-            else:
+            try:
+                mtime = os.stat(locale_path).st_mtime_ns
+            except FileNotFoundError:
                 logger.error(f"Locale file not found: {locale_path}")
-                # Fallback to empty or default?
-                # Ideally load default (en or ru) if requested fails, but let's stick to current
+                # Keep the current translations rather than showing raw keys
+                return
+
+            cached = self._locale_cache.get(lang_code)
+            if cached is not None and cached[0] == mtime:
+                # Switching back to a language already loaded skips the parse
+                self.translations = cached[1]
+                return
+
+            data = read_json_file(locale_path)
+            # Interned keys match the literal keys in tr() calls by identity
+            self.translations = {sys.intern(k): v for k, v in data.items()}
+            self._locale_cache[lang_code] = (mtime, self.translations)
+            logger.info(f"Loaded locale: {lang_code}")
         except Exception as e:
             logger.error(f"Failed to load locale {lang_code}: {e}")
 
@@ -83,7 +95,8 @@ def tr(key: str) -> str:
     Returns:
         Translated string, or key itself if not found
     """
-    return _manager.tr(key)
+    # Direct dict lookup; tr() is imported by value, so it cannot be rebound
+    return _manager.translations.get(key, key)
 
 
 def set_language(lang_code: str) -> None:
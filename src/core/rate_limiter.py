@@ -0,0 +1,88 @@
+"""
+Client-side rate limiter for OpenAI API requests.
+
+This module provides a token-bucket limiter that throttles requests before
+they are sent, so the account's requests-per-minute and tokens-per-minute
+limits are respected without waiting for 429 responses.
+"""
+
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests and tokens per minute.
+
+    Both buckets refill continuously at their per-minute rate and are capped
+    at one minute of capacity.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int) -> None:
+        """
+        Initialize rate limiter with full buckets.
+
+        Args:
+            requests_per_minute: Maximum requests per minute
+            tokens_per_minute: Maximum tokens per minute
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.request_capacity = float(requests_per_minute)
+        self.token_capacity = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add capacity for the time elapsed since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self.request_capacity = min(
+            float(self.requests_per_minute),
+            self.request_capacity + elapsed * self.requests_per_minute / 60.0,
+        )
+        self.token_capacity = min(
+            float(self.tokens_per_minute),
+            self.token_capacity + elapsed * self.tokens_per_minute / 60.0,
+        )
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Wait until one request and the given number of tokens are available.
+
+        Args:
+            tokens: Estimated tokens the request will consume
+        """
+        # A single request larger than the bucket would never fit
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.request_capacity >= 1 and self.token_capacity >= tokens:
+                    self.request_capacity -= 1
+                    self.token_capacity -= tokens
+                    return
+
+                wait_time = max(
+                    (1 - self.request_capacity) * 60.0 / self.requests_per_minute,
+                    (tokens - self.token_capacity) * 60.0 / self.tokens_per_minute,
+                )
+                logger.debug(f"Rate limit reached locally, waiting {wait_time:.2f}s")
+                await asyncio.sleep(wait_time)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Correct the token bucket once the real usage of a request is known.
+
+        Args:
+            estimated_tokens: Tokens reserved by acquire()
+            actual_tokens: Tokens reported by the API
+        """
+        self.token_capacity = min(
+            float(self.tokens_per_minute),
+            self.token_capacity + estimated_tokens - actual_tokens,
+        )
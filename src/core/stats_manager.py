@@ -1,10 +1,19 @@
-import json
+import atexit
 import os
 import logging
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
-from .config import get_app_dir, load_settings, save_settings_file
+from .config import (
+    SETTINGS_PATH,
+    get_app_dir,
+    load_settings,
+    read_json_file,
+    write_json_file,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +24,18 @@ DEFAULT_WHISPER_PRICE_PER_MIN = 0.006
 DEFAULT_GPT_INPUT_PRICE_1M = 0.15
 DEFAULT_GPT_OUTPUT_PRICE_1M = 0.60
 
+# Usage updates are written to disk at most this often (seconds)
+STATS_FLUSH_INTERVAL = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class Pricing:
+    """Model prices in USD."""
+    whisper_price: float  # per minute
+    gpt_input_price: float  # per 1M tokens
+    gpt_output_price: float  # per 1M tokens
+
+
 class StatsManager:
     """
     Manages application usage statistics and cost calculation.
@@ -22,68 +43,109 @@ class StatsManager:
     def __init__(self):
         self.stats_path = os.path.join(get_app_dir(), "stats.json")
         self.stats = self.load_stats()
+        self._lock = threading.Lock()
+        self._flush_timer = None
+        self._pricing = None
+        self._pricing_mtime = None
+        atexit.register(self.flush)
 
     def load_stats(self) -> Dict[str, Any]:
         """Load statistics from JSON file."""
         try:
-            if os.path.exists(self.stats_path):
-                with open(self.stats_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+            return read_json_file(self.stats_path)
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.error(f"Error loading stats: {e}")
 
+        return self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        """Zeroed statistics; last_reset is an epoch timestamp formatted on display."""
         return {
             "total_seconds": 0.0,
             "total_prompt_tokens": 0,
             "total_completion_tokens": 0,
-            "last_reset": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "last_reset": time.time()
         }
 
+    def get_last_reset(self) -> str:
+        """Format the last reset time for display."""
+        last_reset = self.stats.get("last_reset")
+        if isinstance(last_reset, (int, float)):
+            return datetime.fromtimestamp(last_reset).strftime("%Y-%m-%d %H:%M:%S")
+        # Older stats files store the formatted string
+        return last_reset or ""
+
     def save_stats(self):
         """Save statistics to JSON file."""
-        try:
-            with open(self.stats_path, "w", encoding="utf-8") as f:
-                json.dump(self.stats, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"Error saving stats: {e}")
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            try:
+                write_json_file(self.stats_path, self.stats)
+            except Exception as e:
+                logger.error(f"Error saving stats: {e}")
+
+    def flush(self):
+        """Write pending usage updates now, if any."""
+        if self._flush_timer is not None:
+            self.save_stats()
 
     def add_usage(self, whisper_seconds: float = 0.0, prompt_tokens: int = 0, completion_tokens: int = 0):
-        """Add usage data to totals."""
-        self.stats["total_seconds"] += whisper_seconds
-        self.stats["total_prompt_tokens"] += prompt_tokens
-        self.stats["total_completion_tokens"] += completion_tokens
-        self.save_stats()
+        """Add usage data to totals; the file is written within STATS_FLUSH_INTERVAL."""
+        with self._lock:
+            self.stats["total_seconds"] += whisper_seconds
+            self.stats["total_prompt_tokens"] += prompt_tokens
+            self.stats["total_completion_tokens"] += completion_tokens
+            # Updates arriving before the timer fires share one write
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(STATS_FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
 
-    def get_pricing(self) -> Dict[str, float]:
-        """Get pricing constants from settings or defaults."""
-        settings = load_settings()
-        return {
-            "whisper_price": settings.get("price_whisper", DEFAULT_WHISPER_PRICE_PER_MIN),
-            "gpt_input_price": settings.get("price_gpt_input", DEFAULT_GPT_INPUT_PRICE_1M),
-            "gpt_output_price": settings.get("price_gpt_output", DEFAULT_GPT_OUTPUT_PRICE_1M)
-        }
+    def get_pricing(self) -> Pricing:
+        """Get pricing from settings or defaults, rebuilt only when settings change."""
+        try:
+            mtime = os.stat(SETTINGS_PATH).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._pricing is None or mtime != self._pricing_mtime:
+            settings = load_settings()
+            self._pricing = Pricing(
+                whisper_price=settings.get("price_whisper", DEFAULT_WHISPER_PRICE_PER_MIN),
+                gpt_input_price=settings.get("price_gpt_input", DEFAULT_GPT_INPUT_PRICE_1M),
+                gpt_output_price=settings.get("price_gpt_output", DEFAULT_GPT_OUTPUT_PRICE_1M),
+            )
+            self._pricing_mtime = mtime
+        return self._pricing
 
-    def calculate_costs(self) -> Dict[str, float]:
-        """Calculate costs based on current stats and pricing."""
+    def _item_costs(self) -> Tuple[float, float, float]:
+        """Calculate the Whisper, GPT input and GPT output costs."""
         pricing = self.get_pricing()
+        return (
+            self.stats["total_seconds"] / 60.0 * pricing.whisper_price,
+            self.stats["total_prompt_tokens"] / 1_000_000.0 * pricing.gpt_input_price,
+            self.stats["total_completion_tokens"] / 1_000_000.0 * pricing.gpt_output_price,
+        )
 
-        whisper_cost = (self.stats["total_seconds"] / 60.0) * pricing["whisper_price"]
-        gpt_input_cost = (self.stats["total_prompt_tokens"] / 1_000_000.0) * pricing["gpt_input_price"]
-        gpt_output_cost = (self.stats["total_completion_tokens"] / 1_000_000.0) * pricing["gpt_output_price"]
-
+    def calculate_costs(self) -> Dict[str, float]:
+        """Calculate costs based on current stats and pricing."""
+        whisper_cost, gpt_input_cost, gpt_output_cost = self._item_costs()
         return {
             "whisper_cost": whisper_cost,
             "gpt_input_cost": gpt_input_cost,
             "gpt_output_cost": gpt_output_cost,
-            "total_cost": whisper_cost + gpt_input_cost + gpt_output_cost
+            "total_cost": whisper_cost + gpt_input_cost + gpt_output_cost,
         }
 
+    def total_cost(self) -> float:
+        """Calculate only the total cost, without the per-item breakdown."""
+        return sum(self._item_costs())
+
     def reset_stats(self):
         """Reset all statistics."""
-        self.stats = {
-            "total_seconds": 0.0,
-            "total_prompt_tokens": 0,
-            "total_completion_tokens": 0,
-            "last_reset": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        self.stats = self._empty_stats()
         self.save_stats()
@@ -5,13 +5,94 @@ This module provides functionality to paste text into active applications
 using keyboard simulation.
 """
 
-import pyperclip
-import keyboard
+import sys
+import ctypes
 import time
 import logging
 
+from .config import PASTE_CLIPBOARD_TIMEOUT, PASTE_POLL_INTERVAL, PASTE_UNICODE_MAX_CHARS
+
 logger = logging.getLogger(__name__)
 
+# pyperclip and keyboard probe platform backends on import, so they are
+# imported on the first paste
+pyperclip = None
+keyboard = None
+
+
+def _load_paste_modules():
+    """Import pyperclip and keyboard once and return them."""
+    global pyperclip, keyboard
+    if pyperclip is None:
+        import pyperclip as pyperclip_module
+
+        pyperclip = pyperclip_module
+    if keyboard is None:
+        import keyboard as keyboard_module
+
+        keyboard = keyboard_module
+    return pyperclip, keyboard
+
+
+# The clipboard sequence number lets us wait for the copy instead of sleeping
+_user32 = ctypes.windll.user32 if sys.platform == "win32" else None
+
+_INPUT_KEYBOARD = 1
+_KEYEVENTF_KEYUP = 0x0002
+_KEYEVENTF_UNICODE = 0x0004
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", ctypes.c_ushort),
+        ("wScan", ctypes.c_ushort),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    # Only present so the union, and therefore INPUT, has its native size
+    _fields_ = [
+        ("dx", ctypes.c_long),
+        ("dy", ctypes.c_long),
+        ("mouseData", ctypes.c_ulong),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("ki", _KEYBDINPUT), ("mi", _MOUSEINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("union", _INPUTUNION)]
+
+
+def _send_unicode(text: str) -> bool:
+    """
+    Type text with one SendInput call of Unicode key-down/key-up events.
+
+    Args:
+        text: Text to type
+
+    Returns:
+        False if nothing was injected (e.g. input blocked by a higher-integrity window)
+    """
+    # SendInput takes UTF-16 code units, so astral characters become surrogate pairs
+    units = memoryview(text.encode("utf-16-le")).cast("H")
+    inputs = (_INPUT * (len(units) * 2))()
+    for i, unit in enumerate(units):
+        down, up = inputs[2 * i], inputs[2 * i + 1]
+        down.type = up.type = _INPUT_KEYBOARD
+        down.union.ki.wScan = up.union.ki.wScan = unit
+        down.union.ki.dwFlags = _KEYEVENTF_UNICODE
+        up.union.ki.dwFlags = _KEYEVENTF_UNICODE | _KEYEVENTF_KEYUP
+    return _user32.SendInput(len(inputs), inputs, ctypes.sizeof(_INPUT)) > 0
+
 
 class TextProcessor:
     """
@@ -27,22 +108,47 @@ class TextProcessor:
             text: Text to paste
 
         Note:
-            Uses pyperclip to copy text to clipboard and keyboard.send() to
-            simulate Ctrl+V paste action. Waits 0.2s for clipboard update.
+            On Windows, short single-line text is typed directly with
+            SendInput, leaving the clipboard untouched. Otherwise uses
+            pyperclip to copy text to clipboard and keyboard.send() to
+            simulate Ctrl+V paste action. On Windows, waits until the clipboard
+            sequence number changes, elsewhere until the clipboard reads back
+            the text; both give up after PASTE_CLIPBOARD_TIMEOUT.
         """
         if not text:
             return
 
         try:
+            if (
+                _user32 is not None
+                and len(text) <= PASTE_UNICODE_MAX_CHARS
+                and "\n" not in text
+                and _send_unicode(text)
+            ):
+                logger.debug("Text typed via SendInput.")
+                return
+
+            clipboard, keys = _load_paste_modules()
+            if _user32 is not None:
+                sequence = _user32.GetClipboardSequenceNumber()
+
             # Copy new text
-            pyperclip.copy(text)
-
-            # Simulating Ctrl+V
-            # Wait a bit for clipboard update.
-            # 0.1 is usually enough, but 0.2 is safer for slower apps.
-            time.sleep(0.2)
-            keyboard.send("ctrl+v")
-            logger.info("Text pasted via keyboard simulation.")
+            clipboard.copy(text)
+
+            # Wait for the clipboard update before simulating Ctrl+V
+            deadline = time.monotonic() + PASTE_CLIPBOARD_TIMEOUT
+            if _user32 is not None:
+                while (
+                    _user32.GetClipboardSequenceNumber() == sequence
+                    and time.monotonic() < deadline
+                ):
+                    time.sleep(PASTE_POLL_INTERVAL)
+            else:
+                # No sequence number elsewhere; read the clipboard back instead
+                while clipboard.paste() != text and time.monotonic() < deadline:
+                    time.sleep(PASTE_POLL_INTERVAL)
+            keys.send("ctrl+v")
+            logger.debug("Text pasted via keyboard simulation.")
 
         except Exception as e:
             logger.error(f"Failed to paste text: {e}")
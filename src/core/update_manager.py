@@ -1,116 +1,268 @@
 import os
 import sys
+import asyncio
+import functools
+import hashlib
+import re
 import subprocess
 import logging
 import httpx
-from PyQt6.QtCore import QObject, pyqtSignal, QThread
-from .config import APP_VERSION, get_app_dir
+from PyQt6.QtCore import QObject, pyqtSignal
+from .async_runner import AsyncRunner
+from .config import (
+    APP_VERSION,
+    UPDATE_DOWNLOAD_CHUNK_SIZE,
+    UPDATE_KEEPALIVE_EXPIRY,
+    UPDATE_MAX_KEEPALIVE_CONNECTIONS,
+    get_app_dir,
+    read_json_file,
+    write_json_file,
+)
 
 logger = logging.getLogger(__name__)
 
-class UpdateDownloader(QThread):
-    """Thread for downloading update asset."""
-    progress = pyqtSignal(int)
-    finished = pyqtSignal(bool, str)
+# SHA-256 hex digest published in the release notes
+_SHA256_RE = re.compile(r"\b[0-9a-f]{64}\b", re.IGNORECASE)
 
-    def __init__(self, url: str, dest_path: str):
-        super().__init__()
-        self.url = url
-        self.dest_path = dest_path
 
-    def run(self):
-        try:
-            with httpx.stream("GET", self.url, follow_redirects=True) as response:
-                if response.status_code != 200:
-                    self.finished.emit(False, f"HTTP {response.status_code}")
-                    return
+def _body_sha256(body: str, asset_name: str) -> str | None:
+    """
+    Find the digest published for an asset in the release notes.
 
-                total = int(response.headers.get("Content-Length", 0))
-                downloaded = 0
+    Only a digest on the same line as the asset name counts (e.g.
+    "<hex>  S-Flow.exe"), so digests of other files are never used.
 
-                with open(self.dest_path, "wb") as f:
-                    for chunk in response.iter_bytes():
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total > 0:
-                            percent = int((downloaded / total) * 100)
-                            self.progress.emit(percent)
+    Args:
+        body: Release notes text
+        asset_name: File name of the downloaded asset
+
+    Returns:
+        Hex digest, or None if no line names the asset with a digest
+    """
+    for line in body.splitlines():
+        if asset_name.lower() in line.lower():
+            match = _SHA256_RE.search(line)
+            if match:
+                return match.group(0)
+    return None
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_version(version: str) -> tuple[int, ...]:
+    """
+    Parse a dotted version into a comparable tuple.
+
+    Trailing zero components are dropped so "1.2" and "1.2.0" compare equal.
+
+    Raises:
+        ValueError: If a component is not an integer
+    """
+    parts = [int(p) for p in version.split(".")]
+    while parts and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
 
-                self.finished.emit(True, self.dest_path)
-        except Exception as e:
-            logger.exception("Download failed")
-            self.finished.emit(False, str(e))
 
 class UpdateManager(QObject):
-    """Manages application updates via GitHub Releases."""
+    """
+    Manages application updates via GitHub Releases.
+
+    Release checks and downloads run as coroutines on the shared AsyncRunner
+    loop; signals are delivered to the GUI thread by Qt.
+    """
     update_available = pyqtSignal(str, str, str)  # version, description, download_url
     download_progress = pyqtSignal(int)
     download_finished = pyqtSignal(bool, str)
     error = pyqtSignal(str)
     not_found = pyqtSignal()
 
-    def __init__(self, repo: str = "id-ex/S-Flow"):
+    def __init__(self, runner: AsyncRunner, repo: str = "id-ex/S-Flow"):
         super().__init__()
+        self.runner = runner
         self.repo = repo
         self.api_url = f"https://api.github.com/repos/{repo}/releases/latest"
-        self.downloader = None
+        self.download_future = None
+        self.expected_sha256 = None  # Digest of the offered update, if published
+        self._client = None  # Created on the runner loop on first use
+        self.cache_path = os.path.join(get_app_dir(), "update_cache.json")
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Keep-alive pool shared by the release check and the asset download."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=UPDATE_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=UPDATE_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._client
 
     def check_for_updates(self, manual: bool = False):
-        """Check for latest release on GitHub."""
-        def _check():
-            try:
-                response = httpx.get(self.api_url, follow_redirects=True)
-                if response.status_code == 200:
-                    data = response.json()
-                    latest_version = data["tag_name"].lstrip("v")
-
-                    if self._is_newer(latest_version, APP_VERSION):
-                        # Find S-Flow.exe in assets
-                        download_url = None
-                        for asset in data.get("assets", []):
-                            if asset["name"] == "S-Flow.exe":
-                                download_url = asset["browser_download_url"]
-                                break
-
-                        if download_url:
-                            self.update_available.emit(
-                                latest_version,
-                                data.get("body", ""),
-                                download_url
-                            )
-                        else:
-                            logger.warning("No S-Flow.exe found in latest release assets")
-                            if manual: self.not_found.emit()
-                    else:
-                        logger.info(f"App is up to date (Local: {APP_VERSION}, Remote: {latest_version})")
-                        if manual: self.not_found.emit()
-                else:
-                    logger.error(f"GitHub API returned {response.status_code}")
-                    if manual: self.error.emit(f"GitHub API Error: {response.status_code}")
-            except Exception as e:
-                logger.exception("Update check failed")
-                if manual: self.error.emit(str(e))
+        """Check for latest release on GitHub without blocking the UI."""
+        self.runner.submit(self._check(manual))
+
+    def _load_release_cache(self) -> dict:
+        """Last seen release and its ETag, or an empty dict."""
+        try:
+            return read_json_file(self.cache_path)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable update cache: {e}")
+            return {}
+
+    async def _fetch_release(self) -> dict:
+        """
+        Fetch the latest release, revalidating the cached copy by ETag.
+
+        Returns:
+            Dict with latest_version, description, download_url and sha256
+
+        Raises:
+            RuntimeError: If GitHub returned an error status
+        """
+        cache = self._load_release_cache()
+        headers = {"Accept": "application/vnd.github+json"}
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+
+        response = await self._get_client().get(self.api_url, headers=headers)
+        if response.status_code == 304:
+            # Release unchanged: no body to download or parse
+            return cache
+        if response.status_code != 200:
+            logger.error(f"GitHub API returned {response.status_code}")
+            raise RuntimeError(f"GitHub API Error: {response.status_code}")
 
-        # Run in a simple thread to avoid blocking UI
-        import threading
-        threading.Thread(target=_check, daemon=True).start()
+        data = response.json()
+        # Find S-Flow.exe in assets
+        download_url = None
+        sha256 = None
+        for asset in data.get("assets", []):
+            if asset["name"] == "S-Flow.exe":
+                download_url = asset["browser_download_url"]
+                # GitHub reports asset digests as "sha256:<hex>"
+                digest = asset.get("digest") or ""
+                if digest.startswith("sha256:"):
+                    sha256 = digest.removeprefix("sha256:")
+                break
+
+        body = data.get("body") or ""
+        if sha256 is None and download_url:
+            sha256 = _body_sha256(body, "S-Flow.exe")
+            if sha256 is None:
+                logger.info(
+                    "No SHA-256 for S-Flow.exe in the release notes; update will not be verified"
+                )
+
+        release = {
+            "etag": response.headers.get("ETag"),
+            "latest_version": data["tag_name"].lstrip("v"),
+            "description": body,
+            "download_url": download_url,
+            "sha256": sha256.lower() if sha256 else None,
+        }
+        try:
+            write_json_file(self.cache_path, release)
+        except Exception as e:
+            logger.warning(f"Failed to save update cache: {e}")
+        return release
+
+    async def _check(self, manual: bool = False):
+        try:
+            release = await self._fetch_release()
+            latest_version = release["latest_version"]
+            if self._is_newer(latest_version, APP_VERSION):
+                download_url = release["download_url"]
+                if download_url:
+                    self.expected_sha256 = release.get("sha256")
+                    self.update_available.emit(
+                        latest_version,
+                        release["description"],
+                        download_url
+                    )
+                else:
+                    logger.warning("No S-Flow.exe found in latest release assets")
+                    if manual: self.not_found.emit()
+            else:
+                logger.info(f"App is up to date (Local: {APP_VERSION}, Remote: {latest_version})")
+                if manual: self.not_found.emit()
+        except Exception as e:
+            logger.exception("Update check failed")
+            if manual: self.error.emit(str(e))
 
     def _is_newer(self, latest: str, current: str) -> bool:
         """Simple semantic version comparison."""
         try:
-            l_parts = [int(p) for p in latest.split(".")]
-            c_parts = [int(p) for p in current.split(".")]
-            return l_parts > c_parts
+            return _parse_version(latest) > _parse_version(current)
         except ValueError:
             return latest > current
 
     def start_download(self, url: str):
         """Start downloading the new executable."""
         dest_path = os.path.join(get_app_dir(), "S-Flow.exe.new")
-        self.downloader = UpdateDownloader(url, dest_path)
-        self.downloader.progress.connect(self.download_progress.emit)
-        self.downloader.finished.connect(self.download_finished.emit)
-        self.downloader.start()
+        self.download_future = self.runner.submit(
+            self._download(url, dest_path, self.expected_sha256)
+        )
+
+    def cancel_download(self):
+        """Cancel a running download."""
+        if self.download_future is not None:
+            self.download_future.cancel()
+            self.download_future = None
+
+    async def _download(self, url: str, dest_path: str, expected_sha256: str | None = None):
+        try:
+            async with self._get_client().stream("GET", url) as response:
+                if response.status_code != 200:
+                    self.download_finished.emit(False, f"HTTP {response.status_code}")
+                    return
+
+                total = int(response.headers.get("Content-Length", 0))
+                downloaded = 0
+                last_percent = -1
+                # Hashed as it streams, so the file is never read back
+                digest = hashlib.sha256()
+
+                with open(dest_path, "wb", buffering=UPDATE_DOWNLOAD_CHUNK_SIZE) as f:
+                    async for chunk in response.aiter_bytes(UPDATE_DOWNLOAD_CHUNK_SIZE):
+                        # Disk writes go to a worker thread so API calls on the loop are not held up
+                        await asyncio.to_thread(f.write, chunk)
+                        digest.update(chunk)
+                        downloaded += len(chunk)
+                        if total > 0:
+                            percent = int((downloaded / total) * 100)
+                            # Only signal the GUI thread when the value changes
+                            if percent != last_percent:
+                                last_percent = percent
+                                self.download_progress.emit(percent)
+
+            if expected_sha256 is None:
+                logger.warning("Release publishes no SHA-256, download not verified")
+            elif digest.hexdigest() != expected_sha256:
+                logger.error(f"Update checksum mismatch: expected {expected_sha256}, got {digest.hexdigest()}")
+                os.remove(dest_path)
+                self.download_finished.emit(False, "Checksum mismatch")
+                return
+
+            self.download_finished.emit(True, dest_path)
+        except asyncio.CancelledError:
+            logger.info("Download cancelled")
+            raise
+        except Exception as e:
+            logger.exception("Download failed")
+            self.download_finished.emit(False, str(e))
+
+    async def _close_client(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def close(self):
+        """Cancel any download and close pooled HTTP connections."""
+        self.cancel_download()
+        self.runner.run(self._close_client())
 
     def apply_update(self):
         """Generate updater script and exit to replace EXE."""
@@ -128,22 +280,20 @@ class UpdateManager(QObject):
             return
 
         # Create batch script to swap files
-        # It waits for process to end, swaps, restarts, and deletes itself
+        # It gives this process a second to exit, force-stops it if it is
+        # still running, swaps, restarts, and deletes itself
         bat_content = f"""@echo off
+chcp 65001 > nul
 timeout /t 1 /nobreak > nul
-:loop
-tasklist /fi "imagename eq S-Flow.exe" | find /i "S-Flow.exe" > nul
-if %errorlevel% equ 0 (
-    timeout /t 1 /nobreak > nul
-    goto loop
-)
+taskkill /pid {os.getpid()} /f > nul 2>&1
 del "{exe_path}"
 move "{new_exe_path}" "{exe_path}"
 start "" "{exe_path}"
 del "%~f0"
 """
         try:
-            with open(bat_path, "w", encoding="cp1251") as f:
+            # UTF-8 with chcp 65001 handles install paths in any language
+            with open(bat_path, "w", encoding="utf-8") as f:
                 f.write(bat_content)
 
             logger.info("Launching updater.bat and exiting...")
@@ -1,19 +1,20 @@
 import sys
 import os
-import threading
-import json
+import asyncio
 import logging
+from collections import deque
+from types import MappingProxyType
+from typing import TYPE_CHECKING
 from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu
-from PyQt6.QtGui import QIcon, QAction
-from PyQt6.QtCore import pyqtSignal, QObject, QThread, QTimer, Qt
-from dotenv import load_dotenv, set_key
+from PyQt6.QtGui import QAction
+from PyQt6.QtCore import pyqtSignal, QObject, QTimer, Qt, QLockFile, QFile, QIODevice
 
+from ui.icons import app_icon
 from ui.overlay import StatusOverlay
 from ui.settings_dialog import SettingsDialog
 from core.audio_recorder import AudioRecorder
-from core.hotkey_manager import HotkeyManager
-from core.api_client import ApiClient
-from core.text_process import TextProcessor
+from core.hotkey_controller import HotkeyController, HotkeyType
+from core.async_runner import AsyncRunner
 from core.stats_manager import StatsManager
 from core.update_manager import UpdateManager
 from core.config import (
@@ -22,71 +23,113 @@ from core.config import (
     save_settings_file,
     setup_logging,
     get_model_config,
-    get_resource_path,
     get_app_dir,
+    get_resource_path,
+    LOCK_PATH,
     set_autostart,
+    RECORDING_SAMPLE_RATE,
+    OVERLAY_PARTIAL_CHARS,
+    HISTORY_MAX_MESSAGES,
 )
 from core.locale_manager import tr, set_language, get_current_language
 
+if TYPE_CHECKING:
+    from core.api_client import ApiClient
+
 logger = logging.getLogger(__name__)
 
+# Error strings returned by ApiClient -> locale keys shown in the overlay
+_ERROR_KEY_MAP = MappingProxyType({
+    "Error: Invalid API Key": "error_auth",
+    "Error: Rate Limit Exceeded": "error_rate_limit",
+    "Error: No Connection": "error_connection",
+    "Error: Transcription Failed": "error_transcription",
+    "Error: Unknown": "error_unknown",
+})
+
 
-class ProcessingWorker(QThread):
-    finished = pyqtSignal(str, str, dict)  # raw_text, corrected_text, usage_stats
+class ProcessingJob:
+    """One transcription run, executed as a coroutine on the shared async loop."""
 
     def __init__(
         self,
-        api_client: ApiClient,
-        audio_path: str,
-        history: list,
+        api_client: "ApiClient",
+        audio_data: bytes,
+        history: deque,
         system_prompt: str,
         context_chars: int,
         user_context: str = "",
         is_translation: bool = False,
+        rms_hint: float | None = None,
+        on_partial=None,
+        on_corrected=None,
     ):
-        super().__init__()
         self.api_client = api_client
-        self.audio_path = audio_path
+        self.audio_data = audio_data
         self.history = history
         self.system_prompt = system_prompt
         self.context_chars = context_chars
         self.user_context = user_context
         self.is_translation = is_translation
+        self.rms_hint = rms_hint
+        self.on_partial = on_partial
+        self.on_corrected = on_corrected
+
+    async def process(self):
+        logger.info("Transcribing audio...")
+        # Correction of early sentences overlaps with transcription of the rest
+        raw_text, corrected_text, usage_stats = await self.api_client.transcribe_and_correct(
+            self.audio_data,
+            self.history,
+            self.system_prompt,
+            self.context_chars,
+            self.user_context,
+            is_translation=self.is_translation,
+            rms_hint=self.rms_hint,
+            on_partial=self.on_partial,
+            on_corrected=self.on_corrected,
+        )
 
-    def run(self):
+        if raw_text:
+            logger.info(f"Transcription result: {raw_text[:50]}...")
+            return raw_text, corrected_text, usage_stats
+
+        # Empty transcript without an error means nothing was said
+        return "", corrected_text if corrected_text else tr("no_speech"), usage_stats
+
+    async def run(self):
+        """Returns (raw_text, corrected_text, usage_stats); errors become a message."""
         try:
-            logger.info("Transcribing audio...")
-            raw_text, duration = self.api_client.transcribe(self.audio_path)
-            usage_stats = {"whisper_seconds": duration, "prompt_tokens": 0, "completion_tokens": 0}
-
-            if raw_text and not raw_text.startswith("Error"):
-                logger.info(f"Transcription result: {raw_text[:50]}...")
-                corrected_text, gpt_usage = self.api_client.correct_text(
-                    raw_text,
-                    self.history,
-                    self.system_prompt,
-                    self.context_chars,
-                    self.user_context,
-                    is_translation=self.is_translation,
-                )
-                usage_stats.update(gpt_usage)
-                self.finished.emit(raw_text, corrected_text, usage_stats)
-            else:
-                self.finished.emit(
-                    "", raw_text if raw_text else tr("error_transcription"), usage_stats
-                )
-        except Exception as e:
-            logger.exception("Worker thread error")
-            self.finished.emit("", tr("error_unknown"), {})
+            return await self.process()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Processing job error")
+            return "", tr("error_unknown"), {}
 
 
 class AppController(QObject):
+    # job_id, raw_text, corrected_text, usage_stats; delivered on the GUI thread
+    processing_done = pyqtSignal(int, str, str, dict)
+    # job_id, raw transcript so far
+    processing_partial = pyqtSignal(int, str)
+    # job_id, corrected sentences ready to paste
+    processing_corrected = pyqtSignal(int, str)
+
     def __init__(self, app):
         super().__init__()
         self.app = app
         self.settings = load_settings()
         self.api_key = get_openai_key() or ""
         self.is_processing = False
+        # Results from jobs started before the latest one (or cancelled) are ignored
+        self._job_id = 0
+        self._job_future = None
+        self.processing_done.connect(self._on_job_done)
+        self.processing_partial.connect(self._on_job_partial)
+        self.processing_corrected.connect(self._on_job_corrected)
+        self._pasted_text = ""  # Corrected text of the current job pasted so far
+        self._settings_dialog = None
 
         # Initialize Locale
         lang = self.settings.get("app_language", "ru")
@@ -96,24 +139,21 @@ class AppController(QObject):
         self.overlay = StatusOverlay()
 
         # API & Logic
-        self.api_client = ApiClient(self.api_key) if self.api_key else ApiClient()
-        self.audio_recorder = AudioRecorder()
+        self.async_runner = AsyncRunner()
+        # openai/httpx/tenacity are imported when the first recording is processed
+        self._api_client = None
+        self.audio_recorder = AudioRecorder(sample_rate=RECORDING_SAMPLE_RATE)
         self.stats_manager = StatsManager()
-        self.update_manager = UpdateManager()
+        self.update_manager = UpdateManager(self.async_runner)
 
-        # Activation Hotkey
-        self.hotkey_manager = HotkeyManager(self.settings.get("hotkey", "ctrl+alt+s"))
-        self.hotkey_manager.triggered.connect(self.toggle_standard_recording)
-        self.hotkey_manager.start()
-
-        # Translation Hotkey
-        self.translation_hotkey_manager = HotkeyManager(
-            self.settings.get("translation_hotkey", "ctrl+alt+t")
-        )
-        self.translation_hotkey_manager.triggered.connect(
+        # Activation, translation and cancel hotkeys share one keyboard hook
+        self.hotkey_controller = HotkeyController(self.settings)
+        self.hotkey_controller.triggered_activation.connect(self.toggle_standard_recording)
+        self.hotkey_controller.triggered_translation.connect(
             self.toggle_translation_recording
         )
-        self.translation_hotkey_manager.start()
+        self.hotkey_controller.triggered_cancel.connect(self.cancel_operation)
+        self.hotkey_controller.start_all()
 
         self.available_update_url = None
         self.available_update_version = None
@@ -125,19 +165,13 @@ class AppController(QObject):
         self.update_manager.error.connect(lambda msg: logger.error(f"Update error: {msg}"))
         self.update_manager.not_found.connect(self.on_update_not_found)
 
-        # Cancellation Hotkey
-        self.cancel_hotkey_manager = HotkeyManager(
-            self.settings.get("cancel_hotkey", "ctrl+alt+x")
-        )
-        self.cancel_hotkey_manager.triggered.connect(self.cancel_operation)
-        self.cancel_hotkey_manager.start()
-
-        self.history = []
+        # Bounded, so old messages are evicted instead of copied around forever
+        self.history = deque(maxlen=HISTORY_MAX_MESSAGES)
         self.current_mode = "correction"  # or "translation"
 
         # System Tray
         self.tray_icon = QSystemTrayIcon(
-            QIcon(get_resource_path("assets/icon.ico")), self.app
+            app_icon(), self.app
         )
         self.update_tray_menu()
         self.tray_icon.show()
@@ -147,10 +181,26 @@ class AppController(QObject):
 
         if not self.api_key:
             QTimer.singleShot(1000, self.open_settings)
+        else:
+            # Open the API connection once the tray is up, before the first hotkey
+            QTimer.singleShot(2000, lambda: self.async_runner.submit(self._warm_up_api()))
 
         # Auto-check for updates after 5 seconds
         QTimer.singleShot(5000, lambda: self.update_manager.check_for_updates(manual=False))
 
+    @property
+    def api_client(self) -> "ApiClient":
+        """API client, created on first use to keep the OpenAI SDK off the startup path."""
+        if self._api_client is None:
+            from core.api_client import ApiClient
+
+            self._api_client = ApiClient(self.api_key) if self.api_key else ApiClient()
+        return self._api_client
+
+    async def _warm_up_api(self) -> None:
+        """Create the API client and open its connection on the runner thread."""
+        await self.api_client.warm_up()
+
     def update_tray_menu(self):
         from core.config import APP_VERSION
 
@@ -183,23 +233,23 @@ class AppController(QObject):
 
     def open_settings(self):
         # Stop all hotkeys to prevent triggering while typing in settings
-        self.hotkey_manager.stop()
-        self.translation_hotkey_manager.stop()
-        self.cancel_hotkey_manager.stop()
+        self.hotkey_controller.stop_all()
         logger.info("Hotkeys stopped for settings dialog")
 
         current_lang = get_current_language()
-        dialog = SettingsDialog(
-            None,
+        # Built once and refilled on later opens
+        if self._settings_dialog is None:
+            self._settings_dialog = SettingsDialog(None)
+        dialog = self._settings_dialog
+        dialog.refresh_from(
             self.settings.get("hotkey", "ctrl+alt+s"),
             self.api_key,
             current_lang,
             self.settings.get("cancel_hotkey", "ctrl+alt+x"),
             self.settings.get("translation_hotkey", "ctrl+alt+t"),
             self.settings.get("startup", False),
+            self.settings.get("user_context", ""),
         )
-        # Manually set context because we passed None as parent
-        dialog.context_input.setPlainText(self.settings.get("user_context", ""))
 
         result = dialog.exec()
         if result == 1:  # Accepted
@@ -208,18 +258,16 @@ class AppController(QObject):
             # Update Hotkey
             if dialog.new_hotkey != self.settings.get("hotkey"):
                 self.settings["hotkey"] = dialog.new_hotkey
-                self.hotkey_manager.combination = (
-                    dialog.new_hotkey
-                )  # Update combination
+                self.hotkey_controller.update_hotkey(HotkeyType.ACTIVATION, dialog.new_hotkey)
                 logger.info(f"Hotkey updated to {dialog.new_hotkey}")
                 changes = True
 
             # Update Cancel Hotkey
             if dialog.new_cancel_hotkey != self.settings.get("cancel_hotkey", ""):
                 self.settings["cancel_hotkey"] = dialog.new_cancel_hotkey
-                self.cancel_hotkey_manager.combination = (
-                    dialog.new_cancel_hotkey
-                )  # Update combination
+                self.hotkey_controller.update_hotkey(
+                    HotkeyType.CANCEL, dialog.new_cancel_hotkey
+                )
                 logger.info(f"Cancel Hotkey updated to {dialog.new_cancel_hotkey}")
                 changes = True
 
@@ -229,18 +277,22 @@ class AppController(QObject):
                 if not os.path.exists(env_path):
                     with open(env_path, "w") as f:
                         f.write("")
+                from dotenv import set_key
+
                 set_key(env_path, "OPENAI_API_KEY", dialog.new_api_key)
                 self.api_key = dialog.new_api_key
-                self.api_client = ApiClient(self.api_key)
+                if self._api_client is not None:
+                    # Keeps the caches and the warm connection pool
+                    self._api_client.update_key(self.api_key)
                 logger.info("API Key updated")
                 changes = True
 
             # Update Translation Hotkey
             if dialog.new_translation_hotkey != self.settings.get("translation_hotkey"):
                 self.settings["translation_hotkey"] = dialog.new_translation_hotkey
-                self.translation_hotkey_manager.combination = (
-                    dialog.new_translation_hotkey
-                )  # Update combination
+                self.hotkey_controller.update_hotkey(
+                    HotkeyType.TRANSLATION, dialog.new_translation_hotkey
+                )
                 logger.info(
                     f"Translation Hotkey updated to {dialog.new_translation_hotkey}"
                 )
@@ -251,6 +303,9 @@ class AppController(QObject):
                 self.settings["app_language"] = dialog.new_lang
                 set_language(dialog.new_lang)
                 self.update_tray_menu()  # Refresh tray menu
+                # Its labels are in the old language; rebuild on next open
+                dialog.deleteLater()
+                self._settings_dialog = None
                 logger.info(f"Language updated to {dialog.new_lang}")
                 changes = True
 
@@ -272,9 +327,7 @@ class AppController(QObject):
                 self.overlay.show_message(tr("settings_saved"), duration=2000)
 
         # Restart hotkeys after dialog closes (regardless of Save/Cancel)
-        self.hotkey_manager.start()
-        self.translation_hotkey_manager.start()
-        self.cancel_hotkey_manager.start()
+        self.hotkey_controller.start_all()
         logger.info("Hotkeys restarted after settings dialog")
 
     def open_statistics(self):
@@ -319,20 +372,17 @@ class AppController(QObject):
 
         if self.audio_recorder.recording:
             # Stop recording without processing
-            path = self.audio_recorder.stop_recording()
-            logger.info(f"Recording cancelled. File {path} discarded/ignored.")
+            self.audio_recorder.stop_recording()
+            logger.info("Recording cancelled. Audio discarded.")
             self.overlay.show_message(tr("canceled"), duration=1000)
 
         elif self.is_processing:
-            # Invalidate current processing
-            # We can't kill the thread easily, but we can ignore result.
-            # Best way: set a flag or disconnect signal
-            try:
-                self.worker.finished.disconnect(self.on_processing_finished)
-            except (TypeError, RuntimeError) as e:
-                # TypeError: signal not connected
-                # RuntimeError: signal disconnect failed (wrapped C++ object deleted)
-                logger.debug(f"Signal disconnect warning: {e}")
+            # Cancel the in-flight API calls; a result racing the cancel is
+            # dropped by the job id check
+            self._job_id += 1
+            if self._job_future is not None:
+                self._job_future.cancel()
+                self._job_future = None
             self.is_processing = False
             self.overlay.show_message(tr("canceled"), duration=1000)
             logger.info("Processing cancelled.")
@@ -352,24 +402,24 @@ class AppController(QObject):
 
         if self.audio_recorder.recording:
             # Stop
-            audio_path = self.audio_recorder.stop_recording()
-            if audio_path:
+            audio_data = self.audio_recorder.stop_recording()
+            if audio_data:
                 msg_key = (
                     "translating"
                     if self.current_mode == "translation"
                     else "recognizing"
                 )
                 self.overlay.show_message(tr(msg_key), animate=True)
-                self.process_audio(audio_path)
+                self.process_audio(audio_data)
             else:
                 self.overlay.hide_overlay()
-                logger.warning("Recording stopped but no audio path returned")
+                logger.warning("Recording stopped but no audio data returned")
         else:
             # Start
             self.audio_recorder.start_recording()
             self.overlay.show_message(tr("recording_started"))
 
-    def process_audio(self, audio_path):
+    def process_audio(self, audio_data):
         self.is_processing = True
         is_translation = self.current_mode == "translation"
 
@@ -379,17 +429,57 @@ class AppController(QObject):
         context_chars = self.settings.get("context_window_chars", 3000)
         user_context = self.settings.get("user_context", "")
 
-        self.worker = ProcessingWorker(
+        self._job_id += 1
+        job_id = self._job_id
+        self._pasted_text = ""
+        job = ProcessingJob(
             self.api_client,
-            audio_path,
+            audio_data,
             self.history,
             prompt,
             context_chars,
             user_context,
             is_translation=is_translation,
+            rms_hint=self.audio_recorder.last_rms,
+            on_partial=lambda text: self.processing_partial.emit(job_id, text),
+            on_corrected=lambda text: self.processing_corrected.emit(job_id, text),
+        )
+        # API calls run on the shared loop so connections are reused
+        self._job_future = self.async_runner.submit(job.run())
+        self._job_future.add_done_callback(
+            lambda future: self._emit_job_result(job_id, future)
         )
-        self.worker.finished.connect(self.on_processing_finished)
-        self.worker.start()
+
+    def _emit_job_result(self, job_id, future):
+        """Done-callback on the async loop thread: hand the result to the GUI thread."""
+        if future.cancelled():
+            return
+        self.processing_done.emit(job_id, *future.result())
+
+    def _on_job_partial(self, job_id, raw_text):
+        if job_id != self._job_id:
+            return
+        # Show the tail of the transcript while correction catches up
+        tail = raw_text[-OVERLAY_PARTIAL_CHARS:]
+        if len(tail) < len(raw_text):
+            tail = "…" + tail.lstrip()
+        self.overlay.show_message(tail)
+
+    def _on_job_corrected(self, job_id, text):
+        if job_id != self._job_id:
+            return
+        # Paste each corrected sentence as it streams in
+        from core.text_process import TextProcessor
+
+        TextProcessor.paste_text(text)
+        self._pasted_text += text
+
+    def _on_job_done(self, job_id, raw_text, corrected_text, usage_stats):
+        if job_id != self._job_id:
+            logger.debug(f"Ignoring result of stale processing job {job_id}")
+            return
+        self._job_future = None
+        self.on_processing_finished(raw_text, corrected_text, usage_stats)
 
     def on_processing_finished(self, raw_text, corrected_text, usage_stats):
         self.is_processing = False
@@ -408,83 +498,92 @@ class AppController(QObject):
             # History
             self.history.append({"text": corrected_text, "is_bot": True})
 
-            TextProcessor.paste_text(corrected_text)
+            # Streamed corrections were pasted as they arrived
+            if not self._pasted_text:
+                # Clipboard and keyboard backends load on the first paste
+                from core.text_process import TextProcessor
+
+                TextProcessor.paste_text(corrected_text)
             logger.info("Processing finished successfully")
         else:
-            # Show specific error from worker
-            # Check if it is a localized error key or raw error
-            # For now, worker returns localized strings for known errors
-            error_text = corrected_text
-
-            # If startswith Error: and not known key... simplistic check
-            # Realistically, api_client should return keys or we map them here.
-            # But api_client string returns are mixed.
-            # Let's map common ones if they match exactly
-
-            map_errors = {
-                "Error: Invalid API Key": "error_auth",
-                "Error: Rate Limit Exceeded": "error_rate_limit",
-                "Error: No Connection": "error_connection",
-                "Error: Transcription Failed": "error_transcription",
-                "Error: Unknown": "error_unknown",
-            }
-
-            if error_text in map_errors:
-                error_text = tr(map_errors[error_text])
+            # Known API errors are localized; anything else is shown as-is
+            error_key = _ERROR_KEY_MAP.get(corrected_text)
+            error_text = tr(error_key) if error_key else corrected_text
 
             self.overlay.show_message(error_text, duration=3000)
-            logger.error(f"Processing failed: {error_text}")
+            if corrected_text == tr("no_speech"):
+                # Expected outcome of a silent or empty recording, not a failure
+                logger.info("No speech detected")
+            else:
+                logger.error(f"Processing failed: {error_text}")
 
     def quit_app(self):
         logger.info("Quitting application")
-        self.hotkey_manager.stop()
-        self.translation_hotkey_manager.stop()
-        self.cancel_hotkey_manager.stop()
+        self.hotkey_controller.stop_all()
+        self.stats_manager.flush()
+        try:
+            self.update_manager.close()
+            if self._api_client is not None:
+                from core.api_client import close_http_client
+
+                self.async_runner.run(close_http_client())
+        except Exception as e:
+            logger.error(f"Error closing HTTP client: {e}")
+        self.async_runner.stop()
         self.app.quit()
 
 
+def load_stylesheet() -> str:
+    """Read assets/style.qss, or return an empty stylesheet if it is missing."""
+    style_file = QFile(get_resource_path("assets/style.qss"))
+    if not style_file.open(QIODevice.OpenModeFlag.ReadOnly | QIODevice.OpenModeFlag.Text):
+        logger.warning("Stylesheet not found, using default style")
+        return ""
+    try:
+        return bytes(style_file.readAll()).decode("utf-8")
+    finally:
+        style_file.close()
+
+
 def main():
     setup_logging()
 
-    # Single instance check
-    import ctypes
-
-    mutex_name = "Global\\S-Flow-Single-Instance-Mutex"
-    mutex = None
-    try:
-        mutex = ctypes.windll.kernel32.CreateMutexW(None, False, mutex_name)
-        if ctypes.windll.kernel32.GetLastError() == 183:  # ERROR_ALREADY_EXISTS
+    # Single instance check; a lock left by a crashed process is detected as stale
+    instance_lock = QLockFile(LOCK_PATH)
+    instance_lock.setStaleLockTime(0)
+    if not instance_lock.tryLock(0):
+        if instance_lock.error() == QLockFile.LockError.LockFailedError:
             logger.warning("Another instance is already running. Exiting.")
             return
+        # e.g. a read-only install directory: start without the check
+        logger.error(
+            f"Failed to create instance lock {LOCK_PATH} "
+            f"({instance_lock.error().name}); starting without it"
+        )
+
+    try:
+        from dotenv import load_dotenv
 
         load_dotenv(os.path.join(get_app_dir(), ".env"))
 
-        # Set AppUserModelID for Windows Taskbar Icon
-        myappid = "sflow.recognition.app.1.0"  # arbitrary string
-        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
+        if sys.platform == "win32":
+            import ctypes
+
+            # Set AppUserModelID for Windows Taskbar Icon
+            myappid = "sflow.recognition.app.1.0"  # arbitrary string
+            ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
 
         app = QApplication(sys.argv)
         app.setQuitOnLastWindowClosed(False)
-        app.setWindowIcon(QIcon(get_resource_path("assets/icon.ico")))
+        app.setWindowIcon(app_icon())
+        # Parsed once here; dialogs inherit it instead of loading it per open
+        app.setStyleSheet(load_stylesheet())
 
         controller = AppController(app)
 
         sys.exit(app.exec())
     finally:
-        if mutex:
-            ctypes.windll.kernel32.CloseHandle(mutex)
-
-    # Set AppUserModelID for Windows Taskbar Icon
-    myappid = "sflow.recognition.app.1.0"  # arbitrary string
-    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
-
-    app = QApplication(sys.argv)
-    app.setQuitOnLastWindowClosed(False)
-    app.setWindowIcon(QIcon(get_resource_path("assets/icon.ico")))
-
-    controller = AppController(app)
-
-    sys.exit(app.exec())
+        instance_lock.unlock()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,23 @@
+"""
+Shared application icon.
+
+The ICO file is decoded once on first use (after QApplication exists) and
+reused by the tray, the application and every dialog.
+"""
+
+from functools import cache
+
+from PyQt6.QtGui import QIcon
+
+from core.config import get_resource_path
+
+
+@cache
+def app_icon() -> QIcon:
+    """
+    Return the application icon, loading it on the first call.
+
+    Returns:
+        QIcon for assets/icon.ico
+    """
+    return QIcon(get_resource_path("assets/icon.ico"))
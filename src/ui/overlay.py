@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout
+from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout, QWIDGETSIZE_MAX
 from PyQt6.QtCore import Qt, QTimer
 
 class StatusOverlay(QWidget):
@@ -23,39 +23,52 @@ class StatusOverlay(QWidget):
             font-family: 'Segoe UI';
         """)
         layout.addWidget(self.label)
-        
+
+        # Reused for every message, so a newer message cancels a pending hide
+        self.hide_timer = QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(self.hide)
+
+        self.anim_timer = QTimer(self)
+        self.anim_timer.timeout.connect(self.update_animation)
+
         self.hide()
 
     def show_message(self, text, duration=None, animate=False):
+        # Reset previous animation and pending hide
+        self.anim_timer.stop()
+        self.hide_timer.stop()
+
+        self.label.setMinimumWidth(0)
+        self.label.setMaximumWidth(QWIDGETSIZE_MAX)
+
+        if animate:
+            # Lay out once at the widest frame so the dot animation never resizes
+            self.base_text = text.rstrip(".")
+            self.label.setText(f"{self.base_text}...")
+            self.adjustSize()
+            self.label.setFixedWidth(self.label.width())
+
         self.label.setText(text)
         self.adjustSize()
         self.center_on_screen()
         self.show()
-        
-        # Reset previous animation
-        if hasattr(self, 'anim_timer') and self.anim_timer.isActive():
-            self.anim_timer.stop()
-            
+
         if animate:
-            self.base_text = text.rstrip(".")
             self.dot_count = 0
-            self.anim_timer = QTimer(self)
-            self.anim_timer.timeout.connect(self.update_animation)
             self.anim_timer.start(500) # Update every 500ms
-            
+
         if duration:
-            QTimer.singleShot(duration, self.hide)
+            self.hide_timer.start(duration)
 
     def update_animation(self):
         self.dot_count = (self.dot_count + 1) % 4
         dots = "." * self.dot_count
         self.label.setText(f"{self.base_text}{dots}")
-        self.adjustSize()
-        self.center_on_screen()
 
     def hide_overlay(self):
-        if hasattr(self, 'anim_timer'):
-            self.anim_timer.stop()
+        self.anim_timer.stop()
+        self.hide_timer.stop()
         self.hide()
 
     def center_on_screen(self):
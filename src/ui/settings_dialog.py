@@ -12,10 +12,45 @@ from PyQt6.QtWidgets import (
     QCheckBox,
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QKeySequence, QIcon, QKeyEvent
+from PyQt6.QtGui import QKeySequence, QKeyEvent
 import os
+from functools import cache
 from core.locale_manager import tr
-from core.config import get_resource_path, LOG_PATH
+from core.config import LOG_PATH
+from ui.icons import app_icon
+
+
+def _build_key_names() -> dict[int, str]:
+    """Map common Qt key codes to hotkey names, formatted once via QKeySequence."""
+    keys = [Qt.Key.Key_A.value + i for i in range(26)]
+    keys += [Qt.Key.Key_0.value + i for i in range(10)]
+    keys += [Qt.Key.Key_F1.value + i for i in range(24)]
+    keys += [
+        key.value
+        for key in (
+            Qt.Key.Key_Space, Qt.Key.Key_Tab, Qt.Key.Key_Return, Qt.Key.Key_Enter,
+            Qt.Key.Key_Escape, Qt.Key.Key_Insert, Qt.Key.Key_Home, Qt.Key.Key_End,
+            Qt.Key.Key_PageUp, Qt.Key.Key_PageDown, Qt.Key.Key_Left, Qt.Key.Key_Right,
+            Qt.Key.Key_Up, Qt.Key.Key_Down, Qt.Key.Key_Print, Qt.Key.Key_Pause,
+        )
+    ]
+    return {key: QKeySequence(key).toString().lower() for key in keys}
+
+
+# Qt key code -> hotkey name, so key presses skip QKeySequence formatting
+_KEY_NAMES = _build_key_names()
+
+
+# "ctrl"/"alt"/"shift" prefixes indexed by a ctrl=1, alt=2, shift=4 bitmask
+_MOD_PREFIX = (
+    "", "ctrl+", "alt+", "ctrl+alt+", "shift+", "ctrl+shift+", "alt+shift+", "ctrl+alt+shift+",
+)
+
+
+@cache
+def _key_sequence_name(key: int) -> str:
+    """Format a key outside _KEY_NAMES via QKeySequence, once per key code."""
+    return QKeySequence(key).toString().lower()
 
 
 class HotkeyEdit(QLineEdit):
@@ -25,6 +60,10 @@ class HotkeyEdit(QLineEdit):
         self.setReadOnly(True)  # Prevent manual typing, only capture
 
     def keyPressEvent(self, event: QKeyEvent):
+        # Holding a chord repeats the same press; the text is already set
+        if event.isAutoRepeat():
+            return
+
         key = event.key()
         modifiers = event.modifiers()
 
@@ -41,28 +80,24 @@ class HotkeyEdit(QLineEdit):
         ):
             return
 
-        # Build string
-        keys = []
-        if modifiers & Qt.KeyboardModifier.ControlModifier:
-            keys.append("ctrl")
-        if modifiers & Qt.KeyboardModifier.AltModifier:
-            keys.append("alt")
-        if modifiers & Qt.KeyboardModifier.ShiftModifier:
-            keys.append("shift")
-
-        # Get key text - use event.text() for alphanumeric keys (better for Ctrl+Alt+letter combos)
-        # Otherwise use QKeySequence for special keys (F1, space, etc.)
-        key_text = event.text().lower()
+        prefix = _MOD_PREFIX[
+            bool(modifiers & Qt.KeyboardModifier.ControlModifier)
+            | bool(modifiers & Qt.KeyboardModifier.AltModifier) << 1
+            | bool(modifiers & Qt.KeyboardModifier.ShiftModifier) << 2
+        ]
 
-        # If event.text() is empty or not a simple character, use QKeySequence
-        if not key_text or not key_text.isalnum():
-            key_text = QKeySequence(key).toString().lower()
+        # Latin letters, digits and special keys come from the lookup table;
+        # other layouts' characters from event.text(), the rest via QKeySequence
+        key_text = _KEY_NAMES.get(key)
+        if key_text is None:
+            key_text = event.text().lower()
+            if not key_text or not key_text.isalnum():
+                key_text = _key_sequence_name(key)
 
-        if key_text:
-            keys.append(key_text)
-
-        final_hotkey = "+".join(keys)
-        self.setText(final_hotkey)
+        # Without a key name the modifiers alone are shown, as before
+        hotkey = f"{prefix}{key_text}" if key_text else prefix[:-1]
+        if hotkey != self.text():
+            self.setText(hotkey)
 
 
 class SettingsDialog(QDialog):
@@ -77,17 +112,11 @@ class SettingsDialog(QDialog):
         current_startup: bool = False,
     ):
         super().__init__(parent)
-        self.new_hotkey = current_hotkey
-        self.new_cancel_hotkey = cancel_hotkey
-        self.new_translation_hotkey = translation_hotkey
-        self.new_api_key = current_api_key
-        self.new_lang = current_lang
-        self.new_startup = current_startup
 
         from core.config import APP_VERSION
 
         self.setWindowTitle(f"{tr('settings_title')} v{APP_VERSION}")
-        self.setWindowIcon(QIcon(get_resource_path("assets/icon.ico")))
+        self.setWindowIcon(app_icon())
         self.setFixedSize(400, 520)  # Reverted width after simplifying labels
         self.setWindowFlags(
             self.windowFlags() & ~Qt.WindowType.WindowContextHelpButtonHint
@@ -95,25 +124,27 @@ class SettingsDialog(QDialog):
 
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
+        # Lay out once after all widgets are added, not after each addWidget
+        self.layout.setEnabled(False)
 
         # Hotkey
         self.layout.addWidget(QLabel(tr("hotkey_label")))
-        self.hotkey_input = HotkeyEdit(current_hotkey)
+        self.hotkey_input = HotkeyEdit()
         self.layout.addWidget(self.hotkey_input)
 
         # Translation Hotkey
         self.layout.addWidget(QLabel(tr("translation_hotkey_label")))
-        self.translation_hotkey_input = HotkeyEdit(translation_hotkey)
+        self.translation_hotkey_input = HotkeyEdit()
         self.layout.addWidget(self.translation_hotkey_input)
 
         # Cancel Hotkey
         self.layout.addWidget(QLabel(tr("cancel_hotkey_label")))
-        self.cancel_hotkey_input = HotkeyEdit(cancel_hotkey)
+        self.cancel_hotkey_input = HotkeyEdit()
         self.layout.addWidget(self.cancel_hotkey_input)
 
         # API Key
         self.layout.addWidget(QLabel(tr("api_key_label")))
-        self.api_input = QLineEdit(current_api_key)
+        self.api_input = QLineEdit()
         self.api_input.setEchoMode(QLineEdit.EchoMode.Password)
         self.layout.addWidget(self.api_input)
 
@@ -122,10 +153,6 @@ class SettingsDialog(QDialog):
         self.context_input = QPlainTextEdit("")
         self.context_input.setPlaceholderText(tr("context_placeholder"))
         self.context_input.setFixedHeight(80)
-        # Manually styling for now to match
-        self.context_input.setStyleSheet(
-            "QPlainTextEdit { background-color: #3d3d3d; color: white; border: 1px solid #555; border-radius: 5px; padding: 5px; font-family: 'Segoe UI'; } QPlainTextEdit:focus { border: 2px solid #0078D4; background-color: #454545; }"
-        )
         self.layout.addWidget(self.context_input)
 
         # Language & Startup Row
@@ -135,15 +162,11 @@ class SettingsDialog(QDialog):
         self.lang_combo = QComboBox()
         self.lang_combo.addItem("Русский", "ru")
         self.lang_combo.addItem("English", "en")
-        index = self.lang_combo.findData(current_lang)
-        if index >= 0:
-            self.lang_combo.setCurrentIndex(index)
         lang_startup_layout.addWidget(self.lang_combo)
 
         lang_startup_layout.addSpacing(10)
 
         self.startup_check = QCheckBox(tr("startup_label"))
-        self.startup_check.setChecked(current_startup)
         lang_startup_layout.addWidget(self.startup_check)
 
         lang_startup_layout.addStretch()
@@ -161,14 +184,46 @@ class SettingsDialog(QDialog):
         btn_layout.addWidget(save_btn)
         btn_layout.addWidget(logs_btn)
         self.layout.addLayout(btn_layout)
+        self.layout.setEnabled(True)
+        self.layout.activate()
+
+        self.refresh_from(
+            current_hotkey,
+            current_api_key,
+            current_lang,
+            cancel_hotkey,
+            translation_hotkey,
+            current_startup,
+        )
 
-        self.load_styles()
+    def refresh_from(
+        self,
+        current_hotkey: str = "",
+        current_api_key: str = "",
+        current_lang: str = "ru",
+        cancel_hotkey: str = "ctrl+alt+x",
+        translation_hotkey: str = "ctrl+alt+t",
+        current_startup: bool = False,
+        user_context: str = "",
+    ):
+        """Fill the existing widgets with current values before the dialog is reopened."""
+        self.new_hotkey = current_hotkey
+        self.new_cancel_hotkey = cancel_hotkey
+        self.new_translation_hotkey = translation_hotkey
+        self.new_api_key = current_api_key
+        self.new_lang = current_lang
+        self.new_user_context = user_context
+        self.new_startup = current_startup
 
-    def load_styles(self):
-        style_path = get_resource_path(os.path.join("assets", "style.qss"))
-        if os.path.exists(style_path):
-            with open(style_path, "r", encoding="utf-8") as f:
-                self.setStyleSheet(f.read())
+        self.hotkey_input.setText(current_hotkey)
+        self.translation_hotkey_input.setText(translation_hotkey)
+        self.cancel_hotkey_input.setText(cancel_hotkey)
+        self.api_input.setText(current_api_key)
+        self.context_input.setPlainText(user_context)
+        index = self.lang_combo.findData(current_lang)
+        if index >= 0:
+            self.lang_combo.setCurrentIndex(index)
+        self.startup_check.setChecked(current_startup)
 
     def save_settings(self):
         new_hotkey = self.hotkey_input.text().strip()
@@ -197,7 +252,8 @@ class SettingsDialog(QDialog):
         self.accept()
 
     def open_logs(self):
-        if os.path.exists(LOG_PATH):
+        # startfile reports a missing file itself, so no separate exists() check
+        try:
             os.startfile(LOG_PATH)
-        else:
+        except FileNotFoundError:
             QMessageBox.information(self, tr("app_name"), "Log file not found yet.")
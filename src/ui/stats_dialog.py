@@ -2,12 +2,12 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QPushButton, QGroupBox, QFormLayout, QMessageBox, QFrame
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QIcon
-import os
+from PyQt6.QtCore import Qt, QLocale
+from PyQt6.QtGui import QDoubleValidator
 
 from core.locale_manager import tr
-from core.config import get_resource_path, load_settings, save_settings_file
+from core.config import update_settings
+from ui.icons import app_icon
 
 class StatsDialog(QDialog):
     def __init__(self, stats_manager, parent=None):
@@ -15,12 +15,11 @@ class StatsDialog(QDialog):
         self.stats_manager = stats_manager
 
         self.setWindowTitle(tr("stats_title"))
-        self.setWindowIcon(QIcon(get_resource_path("assets/icon.ico")))
+        self.setWindowIcon(app_icon())
         self.setMinimumWidth(400)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowType.WindowContextHelpButtonHint)
 
         self.init_ui()
-        self.load_styles()
         self.refresh_stats()
 
     def init_ui(self):
@@ -48,9 +47,22 @@ class StatsDialog(QDialog):
 
         pricing = self.stats_manager.get_pricing()
 
-        self.price_whisper_input = QLineEdit(str(pricing["whisper_price"]))
-        self.price_gpt_input_input = QLineEdit(str(pricing["gpt_input_price"]))
-        self.price_gpt_output_input = QLineEdit(str(pricing["gpt_output_price"]))
+        self.price_whisper_input = QLineEdit(str(pricing.whisper_price))
+        self.price_gpt_input_input = QLineEdit(str(pricing.gpt_input_price))
+        self.price_gpt_output_input = QLineEdit(str(pricing.gpt_output_price))
+
+        # Only non-negative numbers with a dot separator are accepted, as float() expects
+        price_validator = QDoubleValidator(0.0, 1e6, 10, self)
+        # str() writes very small prices in scientific notation
+        price_validator.setNotation(QDoubleValidator.Notation.ScientificNotation)
+        price_validator.setLocale(QLocale.c())
+        self.price_inputs = (
+            self.price_whisper_input,
+            self.price_gpt_input_input,
+            self.price_gpt_output_input,
+        )
+        for price_input in self.price_inputs:
+            price_input.setValidator(price_validator)
 
         pricing_layout.addRow(tr("stats_price_whisper"), self.price_whisper_input)
         pricing_layout.addRow(tr("stats_price_gpt_input"), self.price_gpt_input_input)
@@ -97,53 +109,41 @@ class StatsDialog(QDialog):
 
         layout.addLayout(btn_layout)
 
-    def load_styles(self):
-        style_path = get_resource_path(os.path.join("assets", "style.qss"))
-        if os.path.exists(style_path):
-            with open(style_path, "r", encoding="utf-8") as f:
-                self.setStyleSheet(f.read())
-
-        # Add some custom style for the reset button
-        self.setStyleSheet(self.styleSheet() + """
-            QPushButton#reset_btn {
-                background-color: #d32f2f;
-            }
-            QPushButton#reset_btn:hover {
-                background-color: #f44336;
-            }
-        """)
-
     def refresh_stats(self):
         stats = self.stats_manager.stats
+        total_cost = self.stats_manager.total_cost()
 
         # Format duration
         seconds = stats["total_seconds"]
         minutes = int(seconds // 60)
         rem_seconds = int(seconds % 60)
-        self.whisper_val.setText(f"{minutes}m {rem_seconds}s")
-
-        self.gpt_input_val.setText(f"{stats['total_prompt_tokens']}")
-        self.gpt_output_val.setText(f"{stats['total_completion_tokens']}")
 
-        costs = self.stats_manager.calculate_costs()
-        self.total_cost_val.setText(f"${costs['total_cost']:.4f}")
+        # One repaint for all labels instead of one per setText
+        self.setUpdatesEnabled(False)
+        try:
+            self.whisper_val.setText(f"{minutes}m {rem_seconds}s")
+            self.gpt_input_val.setText(f"{stats['total_prompt_tokens']}")
+            self.gpt_output_val.setText(f"{stats['total_completion_tokens']}")
+            self.total_cost_val.setText(f"${total_cost:.4f}")
+        finally:
+            self.setUpdatesEnabled(True)
 
     def save_prices(self):
-        try:
-            new_prices = {
-                "price_whisper": float(self.price_whisper_input.text()),
-                "price_gpt_input": float(self.price_gpt_input_input.text()),
-                "price_gpt_output": float(self.price_gpt_output_input.text())
-            }
+        # Fields can still hold partial input such as an empty string
+        if not all(price_input.hasAcceptableInput() for price_input in self.price_inputs):
+            QMessageBox.warning(self, tr("error_title"), tr("error_invalid_number"))
+            return
 
-            settings = load_settings()
-            settings.update(new_prices)
-            save_settings_file(settings)
+        new_prices = {
+            "price_whisper": float(self.price_whisper_input.text()),
+            "price_gpt_input": float(self.price_gpt_input_input.text()),
+            "price_gpt_output": float(self.price_gpt_output_input.text())
+        }
 
-            self.refresh_stats()
-            QMessageBox.information(self, tr("stats_title"), tr("settings_saved"))
-        except ValueError:
-            QMessageBox.warning(self, tr("error_title"), tr("error_invalid_number"))
+        update_settings(new_prices)
+
+        self.refresh_stats()
+        QMessageBox.information(self, tr("stats_title"), tr("settings_saved"))
 
     def reset_stats(self):
         reply = QMessageBox.question(
@@ -1,6 +1,8 @@
 """
 Test script for S-Flow application
 Tests core components without starting the GUI
+
+Pass --devices to also load PortAudio and show the default input device.
 """
 import sys
 import os
@@ -64,6 +66,12 @@ try:
     print(f"  ✓ AudioRecorder initialized")
     print(f"  ✓ Sample rate: {recorder.sample_rate} Hz")
     print(f"  ✓ Channels: {recorder.channels}")
+
+    # sounddevice loads PortAudio and enumerates host APIs, so only on request
+    if "--devices" in sys.argv:
+        from core.audio_recorder import _load_sounddevice
+        device = _load_sounddevice().query_devices(kind="input")
+        print(f"  ✓ Default input device: {device['name']}")
 except Exception as e:
     print(f"  ✗ Error: {e}")
 
@@ -76,11 +84,11 @@ try:
 except Exception as e:
     print(f"  ✗ Error: {e}")
 
-# Test 6: Hotkey Manager (without actually registering)
-print("\n[6/6] Testing hotkey manager...")
+# Test 6: Hotkey Controller (without actually registering)
+print("\n[6/6] Testing hotkey controller...")
 try:
-    from core.hotkey_manager import HotkeyManager
-    print(f"  ✓ HotkeyManager can be imported")
+    from core.hotkey_controller import HotkeyController
+    print(f"  ✓ HotkeyController can be imported")
     print(f"  ✓ Standard hotkey: {settings.get('hotkey')}")
     print(f"  ✓ Translation hotkey: {settings.get('translation_hotkey')}")
     print(f"  ✓ Cancel hotkey: {settings.get('cancel_hotkey')}")
@@ -2,14 +2,26 @@
 Unit tests for S-Flow core components
 Run with: python -m pytest tests/test_core.py -v
 """
+import io
 import os
-import sys
 import json
+import asyncio
 import pytest
-from unittest.mock import Mock, MagicMock, patch, mock_open
+from types import SimpleNamespace
+from unittest.mock import Mock, MagicMock, AsyncMock, patch
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+def _chat_response(content, prompt_tokens=10, completion_tokens=5):
+    """Build a chat completion response with plain attributes instead of a MagicMock."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+    )
+
+
+def _fake_open(data):
+    """Build an open() replacement returning a fresh seekable BytesIO per call."""
+    return Mock(side_effect=lambda *args, **kwargs: io.BytesIO(data))
 
 
 class TestConfig:
@@ -19,8 +31,9 @@ class TestConfig:
         """Test settings loading"""
         from core.config import load_settings
 
-        with patch('builtins.open', mock_open(read_data='{"test": "value"}')):
-            with patch('os.path.exists', return_value=True):
+        load_settings.cache_clear()
+        with patch('builtins.open', _fake_open(b'{"test": "value"}')):
+            with patch('os.stat', return_value=MagicMock(st_mtime_ns=1)):
                 settings = load_settings()
                 assert settings == {"test": "value"}
 
@@ -28,7 +41,7 @@ class TestConfig:
         """Test settings loading when file doesn't exist"""
         from core.config import load_settings
 
-        with patch('os.path.exists', return_value=False):
+        with patch('os.stat', side_effect=FileNotFoundError):
             settings = load_settings()
             assert settings == {}
 
@@ -56,6 +69,80 @@ class TestConfig:
         assert config["correction_model"] == "gpt-4o-mini"
         assert config["transcription_language"] == "ru"
 
+    def test_save_settings_roundtrip(self, tmp_path):
+        """Test saved settings are written atomically and read back"""
+        from core import config
+
+        path = str(tmp_path / "settings.json")
+        with patch('core.config.SETTINGS_PATH', path):
+            assert config.save_settings_file({"user_context": "Привет"}) is True
+            assert config.load_settings() == {"user_context": "Привет"}
+        assert os.listdir(tmp_path) == ["settings.json"]
+
+    def test_save_settings_skips_unchanged(self, tmp_path):
+        """Test saving identical settings does not rewrite the file"""
+        from core import config
+
+        path = str(tmp_path / "settings.json")
+        with patch('core.config.SETTINGS_PATH', path):
+            assert config.save_settings_file({"hotkey": "ctrl+alt+s"}) is True
+            with patch('core.config.os.replace') as mock_replace:
+                assert config.save_settings_file({"hotkey": "ctrl+alt+s"}) is True
+                mock_replace.assert_not_called()
+                config.save_settings_file({"hotkey": "ctrl+alt+q"})
+                mock_replace.assert_called_once()
+
+    def test_update_settings_merges_without_reparsing(self, tmp_path):
+        """Test partial updates keep other keys and refresh the settings cache"""
+        from core import config
+
+        path = str(tmp_path / "settings.json")
+        with patch('core.config.SETTINGS_PATH', path):
+            config.save_settings_file({"hotkey": "ctrl+alt+s"})
+            assert config.update_settings({"price_whisper": 0.01}) is True
+
+            with patch('core.config.read_json_file') as mock_read:
+                settings = config.load_settings()
+            mock_read.assert_not_called()
+
+        assert settings == {"hotkey": "ctrl+alt+s", "price_whisper": 0.01}
+
+    def test_load_settings_cached_until_modified(self):
+        """Test settings file is parsed again only when its mtime changes"""
+        from core import config
+
+        config.load_settings.cache_clear()
+        stat = MagicMock(st_mtime_ns=100)
+        with patch('builtins.open', _fake_open(b'{"test": "value"}')) as mocked_open, \
+                patch('os.stat', return_value=stat):
+            first = config.load_settings()
+            first["test"] = "changed"
+            assert config.load_settings() == {"test": "value"}
+            assert mocked_open.call_count == 1
+
+            stat.st_mtime_ns = 200
+            config.load_settings()
+            assert mocked_open.call_count == 2
+
+    def test_setup_logging_writes_through_queue(self, tmp_path):
+        """Test queued log records reach the log file once logging stops"""
+        import logging
+        from core import config
+
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        log_path = str(tmp_path / "app.log")
+        try:
+            with patch('core.config.LOG_PATH', log_path), patch('atexit.register'):
+                config.setup_logging()
+                logging.getLogger("sflow.test").info("queued message")
+                config.stop_logging()
+        finally:
+            root.handlers, root.level = saved_handlers, saved_level
+
+        with open(log_path, encoding="utf-8") as f:
+            assert "INFO - queued message" in f.read()
+
 
 class TestLocaleManager:
     """Test locale manager"""
@@ -85,6 +172,17 @@ class TestLocaleManager:
         lang = get_current_language()
         assert lang == "en"
 
+    def test_set_language_reuses_parsed_locale(self):
+        """Test switching back to a loaded language does not parse its file again"""
+        from core.locale_manager import set_language, tr
+
+        set_language("en")
+        set_language("ru")
+        with patch('core.config.read_json_file') as mock_read:
+            set_language("en")
+            mock_read.assert_not_called()
+        assert tr("done") == "Done!"
+
 
 class TestAudioRecorder:
     """Test audio recorder"""
@@ -138,6 +236,178 @@ class TestAudioRecorder:
         mock_stream.stop.assert_called_once()
         mock_stream.close.assert_called_once()
 
+    @patch('core.audio_recorder.sd')
+    def test_callback_copies_into_buffer(self, mock_sd):
+        """Test audio blocks are copied into the preallocated buffer"""
+        import numpy as np
+        from core.audio_recorder import AudioRecorder
+
+        recorder = AudioRecorder(sample_rate=100, buffer_seconds=1)
+        recorder.start_recording()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+
+        block = np.ones((60, 1), dtype=np.int16)
+        callback(block, 60, None, None)
+        callback(block * 2, 60, None, None)
+
+        # The second block does not fit and the buffer grows to keep it
+        assert recorder._frames_written == 120
+        assert len(recorder._buffer) == 200
+        assert (recorder._buffer[:60] == 1).all()
+        assert (recorder._buffer[60:120] == 2).all()
+
+    @patch('core.audio_recorder.sd')
+    def test_stop_recording_returns_wav_data(self, mock_sd):
+        """Test stop_recording returns the recording as in-memory WAV data"""
+        import io
+        import wave
+        import numpy as np
+        from core.audio_recorder import AudioRecorder
+
+        recorder = AudioRecorder(sample_rate=16000, buffer_seconds=1)
+        recorder.start_recording()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        samples = np.arange(800, dtype=np.int16).reshape(-1, 1)
+        callback(samples, 800, None, None)
+
+        data = recorder.stop_recording()
+
+        assert recorder.last_rms > 0
+        with wave.open(io.BytesIO(data), "rb") as wav_file:
+            assert wav_file.getframerate() == 16000
+            assert wav_file.getnchannels() == 1
+            frames = np.frombuffer(wav_file.readframes(800), dtype=np.int16)
+        assert (frames == np.arange(800)).all()
+
+
+class TestHotkeyController:
+    """Test hotkey controller"""
+
+    @patch('core.hotkey_controller.keyboard')
+    def test_update_hotkey_by_type_and_name(self, mock_keyboard):
+        """Test hotkeys are addressed by HotkeyType or legacy name"""
+        from core.hotkey_controller import HotkeyController, HotkeyType
+
+        controller = HotkeyController({"hotkey": "ctrl+alt+s"})
+
+        assert controller.update_hotkey(HotkeyType.CANCEL, "ctrl+alt+q") is True
+        assert controller.get_hotkey("cancel") == "ctrl+alt+q"
+        assert controller.get_hotkey(HotkeyType.ACTIVATION) == "ctrl+alt+s"
+        assert controller.update_hotkey("unknown", "ctrl+a") is False
+        mock_keyboard.hook.assert_not_called()
+
+    @patch('core.hotkey_controller.keyboard')
+    def test_single_hook_dispatches_combinations(self, mock_keyboard):
+        """Test one keyboard hook emits the signal of the pressed combination"""
+        from core.hotkey_controller import HotkeyController
+
+        scan_codes = {"ctrl": (29, 3613), "alt": (56,), "s": (31,), "t": (20,), "x": (45,)}
+        mock_keyboard.parse_hotkey.side_effect = lambda combo: (
+            tuple(scan_codes[key] for key in combo.split("+")),
+        )
+        mock_keyboard.KEY_UP = "up"
+
+        controller = HotkeyController({})
+        activation, translation = Mock(), Mock()
+        controller.triggered_activation.connect(activation)
+        controller.triggered_translation.connect(translation)
+        controller.start_all()
+        on_event = mock_keyboard.hook.call_args.args[0]
+
+        def press(*codes):
+            for code in codes:
+                on_event(Mock(scan_code=code, event_type="down"))
+
+        press(3613, 56, 20, 20)  # right ctrl + alt + t, with auto-repeat
+        translation.assert_called_once()
+        activation.assert_not_called()
+
+        on_event(Mock(scan_code=20, event_type="up"))
+        press(31)  # ctrl and alt still held
+        activation.assert_called_once()
+        mock_keyboard.hook.assert_called_once()
+
+        controller.stop_all()
+        mock_keyboard.unhook.assert_called_once()
+
+    @patch('core.hotkey_controller.keyboard')
+    def test_invalid_hotkey_does_not_disable_others(self, mock_keyboard, caplog):
+        """Test empty, invalid and duplicate combinations are skipped individually"""
+        from core.hotkey_controller import HotkeyController, HotkeyType
+
+        scan_codes = {"ctrl": (29,), "alt": (56,), "s": (31,)}
+
+        def parse_hotkey(combo):
+            if not combo or "?" in combo:
+                raise ValueError(f"Unable to parse {combo!r}")
+            return (tuple(scan_codes[key] for key in combo.split("+")),)
+
+        mock_keyboard.parse_hotkey.side_effect = parse_hotkey
+        controller = HotkeyController(
+            {"hotkey": "ctrl+alt+s", "translation_hotkey": "", "cancel_hotkey": "ctrl+?"}
+        )
+        controller.start_all()
+
+        mock_keyboard.hook.assert_called_once()
+        assert controller._combo_map == {frozenset({29, 56, 31}): HotkeyType.ACTIVATION}
+
+        assert controller.update_hotkey(HotkeyType.CANCEL, "ctrl+alt+s") is True
+        assert controller._combo_map == {frozenset({29, 56, 31}): HotkeyType.ACTIVATION}
+        assert "already used by the activation hotkey" in caplog.text
+
+
+class TestStatsManager:
+    """Test usage statistics persistence"""
+
+    def test_add_usage_is_batched(self, tmp_path):
+        """Test usage updates are written together on flush"""
+        from core.stats_manager import StatsManager
+
+        with patch('core.stats_manager.get_app_dir', return_value=str(tmp_path)):
+            manager = StatsManager()
+        with patch('core.stats_manager.write_json_file') as mock_write:
+            manager.add_usage(whisper_seconds=1.5, prompt_tokens=10)
+            manager.add_usage(whisper_seconds=2.5, completion_tokens=4)
+            mock_write.assert_not_called()
+
+            manager.flush()
+            manager.flush()
+
+        mock_write.assert_called_once()
+        assert manager.stats["total_seconds"] == 4.0
+        assert manager.stats["total_prompt_tokens"] == 10
+        assert manager.stats["total_completion_tokens"] == 4
+
+    def test_calculate_costs_with_cached_pricing(self, tmp_path):
+        """Test costs use settings prices, read once while settings are unchanged"""
+        from core.stats_manager import StatsManager
+
+        with patch('core.stats_manager.get_app_dir', return_value=str(tmp_path)):
+            manager = StatsManager()
+        manager.stats.update(total_seconds=120.0, total_prompt_tokens=1_000_000)
+
+        settings = {"price_whisper": 0.01, "price_gpt_input": 0.5}
+        with patch('core.stats_manager.load_settings', return_value=settings) as mock_load:
+            costs = manager.calculate_costs()
+            manager.calculate_costs()
+
+        assert costs["whisper_cost"] == pytest.approx(0.02)
+        assert costs["gpt_input_cost"] == pytest.approx(0.5)
+        assert mock_load.call_count == 1
+
+    def test_total_cost_matches_breakdown(self, tmp_path):
+        """Test the scalar total equals the total of calculate_costs"""
+        from core.stats_manager import StatsManager
+
+        with patch('core.stats_manager.get_app_dir', return_value=str(tmp_path)):
+            manager = StatsManager()
+        manager.stats.update(
+            total_seconds=90.0, total_prompt_tokens=20_000, total_completion_tokens=5_000
+        )
+
+        with patch('core.stats_manager.load_settings', return_value={}):
+            assert manager.total_cost() == pytest.approx(manager.calculate_costs()["total_cost"])
+
 
 class TestTextProcessor:
     """Test text processor"""
@@ -146,21 +416,56 @@ class TestTextProcessor:
     @patch('core.text_process.pyperclip')
     @patch('core.text_process.keyboard')
     def test_paste_text(self, mock_keyboard, mock_pyperclip, mock_time):
-        """Test text paste functionality"""
+        """Test paste waits only until the clipboard reads back the text"""
         from core.text_process import TextProcessor
 
         test_text = "Test text to paste"
+        mock_pyperclip.paste.side_effect = ["previous text", test_text]
+        mock_time.monotonic.return_value = 0.0
         TextProcessor.paste_text(test_text)
 
         mock_pyperclip.copy.assert_called_once_with(test_text)
         mock_keyboard.send.assert_called_once_with('ctrl+v')
-        mock_time.sleep.assert_called_once_with(0.2)
+        mock_time.sleep.assert_called_once_with(0.002)
+
+    @patch('core.text_process.pyperclip')
+    @patch('core.text_process.keyboard')
+    def test_paste_waits_for_clipboard_sequence(self, mock_keyboard, mock_pyperclip):
+        """Test Windows paste polls the clipboard sequence instead of a fixed sleep"""
+        from core.text_process import TextProcessor
+
+        user32 = Mock()
+        user32.GetClipboardSequenceNumber.side_effect = [7, 7, 8]
+        with patch('core.text_process._user32', user32), \
+                patch('core.text_process.time.sleep') as mock_sleep:
+            TextProcessor.paste_text("Multi-line\ntext")
+
+        mock_sleep.assert_called_once_with(0.002)
+        mock_keyboard.send.assert_called_once_with('ctrl+v')
+
+    @patch('core.text_process.pyperclip')
+    @patch('core.text_process.keyboard')
+    def test_short_text_typed_with_send_input(self, mock_keyboard, mock_pyperclip):
+        """Test short text is typed in one SendInput call without the clipboard"""
+        from core.text_process import TextProcessor
+
+        user32 = Mock()
+        user32.SendInput.side_effect = lambda count, inputs, size: count
+        with patch('core.text_process._user32', user32):
+            TextProcessor.paste_text("Привет 👋")
+
+        count, inputs, _ = user32.SendInput.call_args.args
+        assert count == 2 * 9  # the emoji is a surrogate pair
+        assert inputs[0].union.ki.wScan == ord("П")
+        assert inputs[1].union.ki.dwFlags == 0x0006
+        mock_pyperclip.copy.assert_not_called()
+        mock_keyboard.send.assert_not_called()
 
 
 class TestApiClient:
     """Test API client"""
 
-    @patch('core.api_client.OpenAI')
+    @patch('core.api_client.AsyncOpenAI')
     def test_client_initialization_with_key(self, mock_openai):
         """Test client initialization with API key"""
         from core.api_client import ApiClient
@@ -170,6 +475,31 @@ class TestApiClient:
         assert client.config["transcription_model"] == "whisper-1"
         assert client.config["correction_model"] == "gpt-4o-mini"
 
+    @patch('core.api_client.AsyncOpenAI')
+    def test_clients_share_http_pool(self, mock_openai):
+        """Test all clients reuse one HTTP connection pool"""
+        from core.api_client import ApiClient
+
+        ApiClient("first-key")
+        ApiClient("second-key")
+
+        first, second = mock_openai.call_args_list
+        assert first.kwargs["http_client"] is second.kwargs["http_client"]
+
+    @patch('core.api_client.AsyncOpenAI')
+    def test_update_key_keeps_caches(self, mock_openai):
+        """Test changing the API key keeps cached results and the HTTP pool"""
+        from core.api_client import ApiClient
+
+        client = ApiClient("first-key")
+        client._cache_put("key", "cached")
+        client.update_key("second-key")
+
+        assert mock_openai.call_args.kwargs["api_key"] == "second-key"
+        assert client._cache_get("key") == "cached"
+        first, second = mock_openai.call_args_list
+        assert first.kwargs["http_client"] is second.kwargs["http_client"]
+
     def test_client_initialization_without_key(self):
         """Test client initialization without API key"""
         from core.api_client import ApiClient
@@ -189,19 +519,21 @@ class TestApiClient:
         mock_wave_open.return_value.__enter__.return_value = mock_file
 
         client = ApiClient()
-        text, duration = client.transcribe("test_audio.wav")
+        text, duration = asyncio.run(client.transcribe("test_audio.wav"))
         assert text == "Error: Invalid API Key"
         assert duration == 0.0
 
     @patch('core.api_client.wave.open')
-    @patch('core.api_client.OpenAI')
+    @patch('core.api_client.AsyncOpenAI')
     def test_transcribe_success(self, mock_openai, mock_wave_open):
         """Test successful transcription"""
         from core.api_client import ApiClient
 
         mock_client = MagicMock()
         mock_openai.return_value = mock_client
-        mock_client.audio.transcriptions.create.return_value = MagicMock(text="Hello world")
+        mock_client.audio.transcriptions.create = AsyncMock(
+            return_value=MagicMock(text="Hello world")
+        )
 
         # Mock wave duration
         mock_file = MagicMock()
@@ -210,13 +542,250 @@ class TestApiClient:
         mock_wave_open.return_value.__enter__.return_value = mock_file
 
         client = ApiClient("test-key")
-        with patch('builtins.open', mock_open(read_data=b"audio data")):
-            text, duration = client.transcribe("test_audio.wav")
+        with patch('builtins.open', _fake_open(b"audio data")):
+            text, duration = asyncio.run(client.transcribe("test_audio.wav"))
 
         assert text == "Hello world"
         assert duration == 2.0
 
-    @patch('core.api_client.OpenAI')
+    @patch('core.api_client.AsyncOpenAI')
+    def test_transcribe_in_memory_audio(self, mock_openai):
+        """Test WAV bytes are uploaded directly without touching the disk"""
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.audio.transcriptions.create = AsyncMock(
+            return_value=MagicMock(text="Hello world")
+        )
+
+        client = ApiClient("test-key")
+        with patch('builtins.open') as mocked_open, \
+                patch.object(ApiClient, '_audio_duration', return_value=1.0):
+            text, duration = asyncio.run(client.transcribe(b"RIFF audio"))
+
+        assert (text, duration) == ("Hello world", 1.0)
+        mocked_open.assert_not_called()
+        upload = mock_client.audio.transcriptions.create.call_args.kwargs["file"]
+        assert upload == ("audio.wav", b"RIFF audio", "audio/wav")
+
+    @patch('core.api_client.AsyncOpenAI')
+    def test_transcribe_cache_hit_reports_zero_duration(self, mock_openai):
+        """Test a repeated recording is not uploaded or billed again"""
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.audio.transcriptions.create = AsyncMock(
+            return_value=MagicMock(text="Hello world")
+        )
+
+        client = ApiClient("test-key")
+        with patch.object(ApiClient, '_audio_duration', return_value=1.0):
+            first = asyncio.run(client.transcribe(b"RIFF audio"))
+            second = asyncio.run(client.transcribe(b"RIFF audio"))
+
+        assert first == ("Hello world", 1.0)
+        assert second == ("Hello world", 0.0)
+        mock_client.audio.transcriptions.create.assert_awaited_once()
+
+    @patch('core.api_client.STREAM_CHUNK_CHARS', 10)
+    @patch('core.api_client.AsyncOpenAI')
+    def test_transcribe_and_correct_streaming(self, mock_openai):
+        """Test streamed transcript is corrected sentence by sentence"""
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        async def events():
+            for delta in ["First sentence. ", "Second one."]:
+                yield MagicMock(type="transcript.text.delta", delta=delta)
+
+        mock_client.audio.transcriptions.create = AsyncMock(return_value=events())
+
+        mock_response = _chat_response("Fixed.")
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        client = ApiClient("test-key")
+        client.config["transcription_model"] = "gpt-4o-mini-transcribe"
+        partial = Mock()
+        with patch('builtins.open', _fake_open(b"audio data")):
+            raw, corrected, usage = asyncio.run(
+                client.transcribe_and_correct("test_audio.wav", on_partial=partial)
+            )
+
+        assert raw == "First sentence. Second one."
+        assert corrected == "Fixed. Fixed."
+        partial.assert_called_once_with("First sentence.")
+        assert usage["prompt_tokens"] == 20
+        assert mock_client.chat.completions.create.await_count == 2
+
+    @patch('core.api_client.STREAM_CHUNK_CHARS', 10)
+    @patch('core.api_client.AsyncOpenAI')
+    def test_transcribe_and_correct_whole_transcript_single_call(self, mock_openai):
+        """Test a non-streaming transcript is corrected in one call"""
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.audio.transcriptions.create = AsyncMock(
+            return_value=MagicMock(text="First sentence. Second one.")
+        )
+        mock_client.chat.completions.create = AsyncMock(return_value=_chat_response("Fixed."))
+
+        client = ApiClient("test-key")
+        with patch('builtins.open', _fake_open(b"audio data")):
+            raw, corrected, _ = asyncio.run(client.transcribe_and_correct("test_audio.wav"))
+
+        assert (raw, corrected) == ("First sentence. Second one.", "Fixed.")
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    @patch('core.api_client.AsyncOpenAI')
+    def test_transcribe_and_correct_caches_identical_audio(self, mock_openai):
+        """Test a repeated recording is transcribed once and billed once"""
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.audio.transcriptions.create = AsyncMock(return_value=MagicMock(text="Hello."))
+        mock_response = _chat_response("Hello!")
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        client = ApiClient("test-key")
+        with patch('builtins.open', _fake_open(b"audio data")), \
+                patch.object(ApiClient, '_audio_duration', return_value=2.0):
+            first = asyncio.run(client.transcribe_and_correct("a.wav"))
+            second = asyncio.run(client.transcribe_and_correct("b.wav"))
+
+        assert first[:2] == second[:2] == ("Hello.", "Hello!")
+        assert first[2]["whisper_seconds"] == 2.0
+        assert second[2]["whisper_seconds"] == 0.0
+        mock_client.audio.transcriptions.create.assert_awaited_once()
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    def test_history_prefix_is_stable_until_window_fills(self):
+        """Test new history is appended without shifting the window start"""
+        from core.api_client import ApiClient
+
+        client = ApiClient()
+        history = [{"text": "x" * 10} for _ in range(5)]
+
+        def history_message(messages):
+            return client._build_messages(messages, "Prompt", 60, "", False)[-1]["content"]
+
+        first = history_message(history)
+        second = history_message(history + [{"text": "y" * 5}])
+        assert second.startswith(first)
+
+        # Overflowing the window rotates it down to half of context_chars
+        rotated = history_message(history + [{"text": "y" * 5}, {"text": "z" * 10}])
+        assert rotated == "Context History:\n- " + "x" * 10 + "\n- " + "y" * 5 + "\n- " + "z" * 10
+
+    def test_history_accepts_bounded_deque(self):
+        """Test a bounded deque of history gives the same context as a list"""
+        from collections import deque
+        from core.api_client import ApiClient
+
+        client = ApiClient()
+        history = [{"text": f"message {i}"} for i in range(10)]
+        bounded = deque(history, maxlen=4)
+
+        messages = client._build_messages(bounded, "Prompt", 1000, "", False)
+        expected = client._build_messages(history[-4:], "Prompt", 1000, "", False)
+        assert messages == expected
+
+    @patch('core.api_client.AsyncOpenAI')
+    def test_correct_streamed_emits_whole_sentences(self, mock_openai):
+        """Test streamed corrections are passed on at sentence boundaries"""
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        async def events():
+            for delta in ["Hello", " world. How", " are you?"]:
+                yield MagicMock(choices=[MagicMock(delta=MagicMock(content=delta))], usage=None)
+            yield MagicMock(choices=[], usage=MagicMock(prompt_tokens=12, completion_tokens=6))
+
+        mock_client.chat.completions.create = AsyncMock(return_value=events())
+
+        client = ApiClient("test-key")
+        pieces = []
+        corrected, usage = asyncio.run(client._correct_streamed(
+            "hello world how are you", [], None, 3000, "", False, pieces.append, " "
+        ))
+
+        assert pieces == [" Hello world. ", "How are you?"]
+        assert corrected == "Hello world. How are you?"
+        assert usage == {"prompt_tokens": 12, "completion_tokens": 6}
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    @patch('core.api_client.AsyncOpenAI')
+    def test_correct_streamed_failure_after_partial_text(self, mock_openai):
+        """Test a stream failing midway raises instead of returning truncated text"""
+        from openai import APIConnectionError
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        async def events():
+            for delta in ["Hello world. ", "Second"]:
+                yield MagicMock(choices=[MagicMock(delta=MagicMock(content=delta))], usage=None)
+            raise APIConnectionError(request=MagicMock())
+
+        mock_client.chat.completions.create = AsyncMock(return_value=events())
+
+        client = ApiClient("test-key")
+        pieces = []
+        with pytest.raises(APIConnectionError):
+            asyncio.run(client._correct_streamed(
+                "hello world second sentence", [], None, 3000, "", False, pieces.append, ""
+            ))
+
+        assert pieces == ["Hello world. "]
+        assert not client._exact_cache
+
+    @patch('core.api_client.AsyncOpenAI')
+    def test_transcribe_and_correct_skips_silence(self, mock_openai):
+        """Test silent recordings are not sent to the API"""
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.audio.transcriptions.create = AsyncMock()
+
+        client = ApiClient("test-key")
+        raw, corrected, usage = asyncio.run(
+            client.transcribe_and_correct("test_audio.wav", rms_hint=3.0)
+        )
+
+        assert (raw, corrected) == ("", "")
+        assert usage["whisper_seconds"] == 0.0
+        mock_client.audio.transcriptions.create.assert_not_awaited()
+
+    def test_audio_duration_from_header(self, tmp_path):
+        """Test WAV duration is read from the PCM header"""
+        import wave
+        from core.api_client import ApiClient
+
+        path = str(tmp_path / "audio.wav")
+        with wave.open(path, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(16000)
+            wav_file.writeframes(b"\x00\x00" * 8000)
+
+        with open(path, "rb") as wav_file:
+            audio_data = wav_file.read()
+
+        client = ApiClient()
+        with patch('core.api_client.wave.open') as mock_wave_open:
+            assert client._audio_duration(audio_data) == 0.5
+            mock_wave_open.assert_not_called()
+
+    @patch('core.api_client.AsyncOpenAI')
     def test_correct_text_success(self, mock_openai):
         """Test successful text correction"""
         from core.api_client import ApiClient
@@ -224,20 +793,140 @@ class TestApiClient:
         mock_client = MagicMock()
         mock_openai.return_value = mock_client
 
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = "Corrected text"
-        mock_response.usage.prompt_tokens = 10
-        mock_response.usage.completion_tokens = 5
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_response = _chat_response("Corrected text")
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
         client = ApiClient("test-key")
-        text, usage = client.correct_text("Original text")
+        text, usage = asyncio.run(client.correct_text("Original text"))
 
         assert text == "Corrected text"
         assert usage["prompt_tokens"] == 10
         assert usage["completion_tokens"] == 5
 
-    @patch('core.api_client.OpenAI')
+    @patch('core.api_client.AsyncOpenAI')
+    def test_correct_text_static_prompt_prefix(self, mock_openai):
+        """Test history and user context are sent after the static prompt"""
+        from core.api_client import ApiClient, DEFAULT_CORRECTION_PROMPT
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        mock_response = _chat_response("Corrected text")
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        client = ApiClient("test-key")
+        asyncio.run(client.correct_text(
+            "Original text",
+            [{"text": "Earlier message"}],
+            user_context="Python",
+        ))
+
+        messages = mock_client.chat.completions.create.call_args.kwargs["messages"]
+        assert messages[0] == {"role": "system", "content": DEFAULT_CORRECTION_PROMPT}
+        assert messages[1]["content"] == "[USER CONTEXT: Python]"
+        assert "Earlier message" in messages[2]["content"]
+        assert messages[-1] == {"role": "user", "content": "Original text"}
+
+    @patch('core.api_client.AsyncOpenAI')
+    def test_correct_text_cache_hit(self, mock_openai):
+        """Test identical correction requests are served from cache"""
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        mock_response = _chat_response("Corrected text")
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        client = ApiClient("test-key")
+        asyncio.run(client.correct_text("Original text"))
+        text, usage = asyncio.run(client.correct_text("Original text"))
+
+        assert text == "Corrected text"
+        assert usage["prompt_tokens"] == 0
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    @patch('core.api_client.AsyncOpenAI')
+    def test_correct_text_batch(self, mock_openai):
+        """Test several texts are corrected with a single request"""
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        mock_response = _chat_response("### OUT 1\nFirst.\n### OUT 2\nSecond.", 20, 6)
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        client = ApiClient("test-key")
+        texts, usage = asyncio.run(client.correct_text_batch(["first", "second"]))
+
+        assert texts == ["First.", "Second."]
+        assert usage == {"prompt_tokens": 20, "completion_tokens": 6}
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    @patch('core.api_client.AsyncOpenAI')
+    def test_process_many(self, mock_openai):
+        """Test parallel requests keep input order and report failures"""
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        async def create(model, messages):
+            text = messages[-1]["content"]
+            if text == "bad":
+                raise ValueError("Invalid request")
+            response = _chat_response(text.upper(), 3, 1)
+            return response
+
+        mock_client.chat.completions.create = AsyncMock(side_effect=create)
+
+        client = ApiClient("test-key")
+        requests = [
+            {"messages": [{"role": "user", "content": text}]}
+            for text in ("one", "bad", "two")
+        ]
+        results = asyncio.run(client.process_many(requests, max_concurrency=2))
+
+        assert results[0] == {
+            "content": "ONE",
+            "usage": {"prompt_tokens": 3, "completion_tokens": 1},
+        }
+        assert results[1] == {"error": "Invalid request"}
+        assert results[2]["content"] == "TWO"
+
+    @patch('core.api_client.AsyncOpenAI')
+    @patch('core.api_client.asyncio.sleep', new_callable=AsyncMock)
+    def test_batch_submit_and_poll(self, mock_sleep, mock_openai):
+        """Test Batch API submission and result parsing"""
+        from core.api_client import ApiClient
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.files.create = AsyncMock(return_value=MagicMock(id="file-in"))
+        mock_client.batches.create = AsyncMock(return_value=MagicMock(id="batch-1"))
+        mock_client.batches.retrieve = AsyncMock(side_effect=[
+            MagicMock(status="in_progress"),
+            MagicMock(status="completed", output_file_id="file-out"),
+        ])
+        output = json.dumps({
+            "custom_id": "a",
+            "response": {
+                "status_code": 200,
+                "body": {"choices": [{"message": {"content": " Fixed "}}]},
+            },
+        })
+        mock_client.files.content = AsyncMock(return_value=MagicMock(text=output))
+
+        client = ApiClient("test-key")
+        batch_id = asyncio.run(client.submit_batch({"a": "text"}))
+        results = asyncio.run(client.poll_batch(batch_id))
+
+        assert batch_id == "batch-1"
+        assert results == {"a": "Fixed"}
+        assert mock_sleep.await_count == 1
+
+    @patch('core.api_client.AsyncOpenAI')
     def test_execute_with_retry_success(self, mock_openai):
         """Test successful API call with retry logic"""
         from core.api_client import ApiClient
@@ -248,14 +937,14 @@ class TestApiClient:
         client = ApiClient("test-key")
 
         # Mock function that succeeds
-        def mock_func():
+        async def mock_func():
             return "success"
 
-        result = client._execute_with_retry(mock_func)
+        result = asyncio.run(client._execute_with_retry(mock_func))
         assert result == "success"
 
-    @patch('core.api_client.OpenAI')
-    @patch('core.api_client.time.sleep')
+    @patch('core.api_client.AsyncOpenAI')
+    @patch('core.api_client.asyncio.sleep', new_callable=AsyncMock)
     def test_execute_with_retry_rate_limit(self, mock_sleep, mock_openai):
         """Test retry logic on rate limit error"""
         from core.api_client import ApiClient
@@ -268,19 +957,212 @@ class TestApiClient:
 
         call_count = 0
 
-        def mock_func():
+        async def mock_func():
             nonlocal call_count
             call_count += 1
             if call_count < 2:
                 # Create a proper RateLimitError with required arguments
                 response = MagicMock()
                 response.status_code = 429
+                response.headers = {"retry-after": "2"}
                 raise RateLimitError("Rate limit exceeded", response=response, body="")
             return "success"
 
-        result = client._execute_with_retry(mock_func)
+        result = asyncio.run(client._execute_with_retry(mock_func))
         assert result == "success"
         assert call_count == 2
+        mock_sleep.assert_awaited_once_with(2.0)
+
+    def test_retry_after_reads_rate_limit_reset_headers(self):
+        """Test the wait falls back to the later x-ratelimit-reset-* value"""
+        from core.api_client import ApiClient
+
+        def error_with(headers):
+            return MagicMock(response=MagicMock(headers=headers))
+
+        assert ApiClient._retry_after(error_with({"retry-after-ms": "250"})) == 0.25
+        assert ApiClient._retry_after(error_with({
+            "x-ratelimit-reset-requests": "120ms",
+            "x-ratelimit-reset-tokens": "1.5s",
+        })) == pytest.approx(1.5)
+        assert ApiClient._retry_after(error_with({})) is None
+
+    def test_retry_after_is_capped(self):
+        """Test long server-suggested waits are capped at RETRY_MAX_DELAY"""
+        from core.api_client import ApiClient
+        from core.config import RETRY_MAX_DELAY
+
+        def error_with(headers):
+            return MagicMock(response=MagicMock(headers=headers))
+
+        assert ApiClient._retry_after(
+            error_with({"x-ratelimit-reset-tokens": "6m0s"})
+        ) == RETRY_MAX_DELAY
+        assert ApiClient._retry_after(error_with({"retry-after": "3600"})) == RETRY_MAX_DELAY
+        assert ApiClient._retry_after(error_with({
+            "retry-after": "2",
+            "x-ratelimit-reset-tokens": "6m0s",
+        })) == 2.0
+
+
+class TestRateLimiter:
+    """Test client-side token bucket"""
+
+    def test_acquire_waits_when_bucket_empty(self):
+        """Test requests beyond the per-minute budget wait for refill"""
+        from core.rate_limiter import RateLimiter
+
+        clock = [0.0]
+
+        async def fake_sleep(seconds):
+            clock[0] += seconds
+
+        with patch('core.rate_limiter.time.monotonic', side_effect=lambda: clock[0]), \
+                patch('core.rate_limiter.asyncio.sleep', side_effect=fake_sleep) as mock_sleep:
+            limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=1000)
+
+            async def acquire_many():
+                for _ in range(61):
+                    await limiter.acquire(tokens=10)
+
+            asyncio.run(acquire_many())
+
+        mock_sleep.assert_called_once()
+        assert clock[0] == pytest.approx(1.0)
+
+
+class TestUpdateManager:
+    """Test update checks and downloads"""
+
+    def test_check_reports_newer_release(self, tmp_path):
+        """Test a newer release with an EXE asset emits update_available"""
+        import httpx
+        from core.update_manager import UpdateManager
+
+        release = {
+            "tag_name": "v99.0.0",
+            "body": "notes",
+            "assets": [{"name": "S-Flow.exe", "browser_download_url": "https://example.com/S-Flow.exe"}],
+        }
+        with patch('core.update_manager.get_app_dir', return_value=str(tmp_path)):
+            manager = UpdateManager(Mock())
+        manager._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json=release))
+        )
+        available = Mock()
+        manager.update_available.connect(available)
+
+        asyncio.run(manager._check(manual=True))
+
+        available.assert_called_once_with("99.0.0", "notes", "https://example.com/S-Flow.exe")
+
+    def test_check_revalidates_with_etag(self, tmp_path):
+        """Test a 304 reply reuses the cached release instead of a new body"""
+        import httpx
+        from core.update_manager import UpdateManager
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"tag_name": "v0.1", "assets": []}, headers={"ETag": '"v1"'})
+
+        with patch('core.update_manager.get_app_dir', return_value=str(tmp_path)):
+            manager = UpdateManager(Mock())
+        manager._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        not_found = Mock()
+        manager.not_found.connect(not_found)
+
+        async def check_twice():
+            await manager._check(manual=True)
+            await manager._check(manual=True)
+
+        asyncio.run(check_twice())
+
+        assert "If-None-Match" not in requests[0].headers
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert not_found.call_count == 2
+
+    def test_is_newer_ignores_trailing_zeros(self):
+        """Test version comparison is numeric and length-insensitive"""
+        from core.update_manager import UpdateManager
+
+        manager = UpdateManager(Mock())
+        assert manager._is_newer("1.10", "1.9.0") is True
+        assert manager._is_newer("1.2.0", "1.2") is False
+        assert manager._is_newer("1.2", "1.2.0") is False
+        assert manager._is_newer("1.2.1", "1.2") is True
+
+    def test_download_writes_file_and_progress(self, tmp_path):
+        """Test the asset is streamed to disk with one progress signal per percent"""
+        import httpx
+        from core.update_manager import UpdateManager
+
+        payload = b"x" * 1000
+        manager = UpdateManager(Mock())
+        manager._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=payload))
+        )
+        progress, finished = Mock(), Mock()
+        manager.download_progress.connect(progress)
+        manager.download_finished.connect(finished)
+
+        dest = tmp_path / "S-Flow.exe.new"
+        asyncio.run(manager._download("https://example.com/S-Flow.exe", str(dest)))
+
+        assert dest.read_bytes() == payload
+        progress.assert_called_once_with(100)
+        finished.assert_called_once_with(True, str(dest))
+
+    def test_download_rejects_checksum_mismatch(self, tmp_path):
+        """Test a download whose SHA-256 differs from the release is discarded"""
+        import hashlib
+        import httpx
+        from core.update_manager import UpdateManager
+
+        manager = UpdateManager(Mock())
+        manager._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"truncated"))
+        )
+        finished = Mock()
+        manager.download_finished.connect(finished)
+
+        dest = tmp_path / "S-Flow.exe.new"
+        expected = hashlib.sha256(b"complete").hexdigest()
+        asyncio.run(manager._download("https://example.com/S-Flow.exe", str(dest), expected))
+
+        assert not dest.exists()
+        finished.assert_called_once_with(False, "Checksum mismatch")
+
+    def test_release_notes_digest_matches_asset_line(self):
+        """Test only the digest listed next to S-Flow.exe is used"""
+        from core.update_manager import _body_sha256
+
+        exe_digest, zip_digest = "a" * 64, "b" * 64
+        body = f"Checksums:\n{zip_digest}  S-Flow.zip\n{exe_digest}  S-Flow.exe\n"
+        assert _body_sha256(body, "S-Flow.exe") == exe_digest
+        assert _body_sha256(f"Commit {zip_digest}", "S-Flow.exe") is None
+
+
+class TestAsyncRunner:
+    """Test background event loop runner"""
+
+    def test_run_coroutine(self):
+        """Test coroutines run on the background loop"""
+        from core.async_runner import AsyncRunner
+
+        async def get_loop():
+            return asyncio.get_running_loop()
+
+        runner = AsyncRunner()
+        try:
+            assert runner.run(get_loop()) is runner.loop
+            assert runner.run(get_loop()) is runner.loop
+        finally:
+            runner.stop()
+        assert not runner.thread.is_alive()
 
 
 if __name__ == "__main__":